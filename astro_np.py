@@ -0,0 +1,187 @@
+# astro_np.py
+# Vectorized NumPy versions of the chart calculations in app.py.
+# Every function accepts scalars or arrays and broadcasts like NumPy ufuncs,
+# so a whole batch of birth records is evaluated in one call.
+import numpy as np
+
+NAK_SPAN = 360 / 27
+PADA_SPAN = 360 / 108
+RASHI_SPAN = 30.0
+
+# Julian Date calculation
+def julian_date(year, month, day, hour=0, minute=0, second=0):
+    year = np.asarray(year, dtype=np.int64)
+    month = np.asarray(month, dtype=np.int64)
+    day = np.asarray(day, dtype=np.float64)
+
+    jan_feb = (month == 1) | (month == 2)
+    yearp = np.where(jan_feb, year - 1, year)
+    monthp = np.where(jan_feb, month + 12, month)
+
+    julian = (year < 1582) | ((year == 1582) & ((month < 10) | ((month == 10) & (day < 15))))
+    A = np.floor(yearp / 100)
+    B = np.where(julian, 0.0, 2 - A + np.floor(A / 4))
+
+    C = np.floor(365.25 * (yearp + 4716))
+    D = np.floor(30.6001 * (monthp + 1))
+    jd = B + day + C + D - 1524.5
+    jd = jd + (np.asarray(hour) + np.asarray(minute) / 60.0 + np.asarray(second) / 3600.0) / 24.0
+    return jd
+
+# Split datetime64 values (UTC) into the calendar fields julian_date expects
+def split_datetime64(ts):
+    ts = np.asarray(ts, dtype="datetime64[s]")
+    years = ts.astype("datetime64[Y]")
+    months = ts.astype("datetime64[M]")
+    days = ts.astype("datetime64[D]")
+    year = years.astype(np.int64) + 1970
+    month = (months - years).astype(np.int64) + 1
+    day = (days - months).astype(np.int64) + 1
+    secs = (ts - days).astype(np.int64)
+    hour = secs // 3600
+    minute = (secs % 3600) // 60
+    second = secs % 60
+    return year, month, day, hour, minute, second
+
+def julian_date_from_datetime64(ts):
+    return julian_date(*split_datetime64(ts))
+
+# Calculate Sun's ecliptic longitude
+def calculate_sun_longitude(d):
+    d = np.asarray(d, dtype=np.float64)
+    w = 282.9404 + 4.70935e-5 * d
+    e = 0.016709 - 1.151e-9 * d
+    M = np.mod(356.0470 + 0.9856002585 * d, 360)
+    Mrad = np.radians(M)
+    E = M + np.degrees(e * np.sin(Mrad) * (1.0 + e * np.cos(Mrad)))
+    Erad = np.radians(E)
+    xv = np.cos(Erad) - e
+    yv = np.sin(Erad) * np.sqrt(1.0 - e * e)
+    v = np.degrees(np.arctan2(yv, xv))
+    return np.mod(v + w, 360)
+
+# Moon's perturbation series as (coefficient in arcsec, multipliers of M, MSun, F, D, L0)
+MOON_TERMS = np.array([
+    (22640, 1, 0, 0, 0, 0),
+    (769, 2, 0, 0, 0, 0),
+    (-4586, 1, 0, 0, -2, 0),
+    (2370, 0, 0, 0, 2, 0),
+    (-668, 0, 1, 0, 0, 0),
+    (-412, 0, 0, 2, 0, 0),
+    (-125, 0, 0, 0, 1, 0),
+    (-212, 2, 0, 0, -2, 0),
+    (-206, 1, 1, 0, -2, 0),
+    (192, 1, 0, 0, 2, 0),
+    (-165, 0, 1, 0, -2, 0),
+    (148, 0, -1, 0, 0, 1),
+    (-110, 1, 1, 0, 0, 0),
+    (-55, 0, 0, 2, -2, 0),
+], dtype=np.float64)
+
+def moon_arguments(d):
+    T = np.asarray(d, dtype=np.float64) / 36525.0
+    L0 = 218.31617 + 481267.88088 * T - 4.06 * T**2 / 3600.0
+    M = 134.96292 + 477198.86753 * T + 33.25 * T**2 / 3600.0
+    MSun = 357.52543 + 35999.04944 * T - 0.58 * T**2 / 3600.0
+    F = 93.27283 + 483202.01873 * T - 11.56 * T**2 / 3600.0
+    D = 297.85027 + 445267.11135 * T - 5.15 * T**2 / 3600.0
+    return L0, M, MSun, F, D
+
+# Improved Moon's ecliptic longitude calculation
+def calculate_moon_longitude(d, terms=MOON_TERMS):
+    L0, M, MSun, F, D = moon_arguments(d)
+    args = np.stack(np.broadcast_arrays(M, MSun, F, D, L0), axis=-1)
+    # (..., 5) @ (5, n_terms) gives every term's argument at once
+    phases = np.radians(args @ terms[:, 1:].T)
+    Delta = np.sin(phases) @ terms[:, 0] / 3600.0
+    return np.mod(L0 + Delta, 360)
+
+# Lahiri Ayanamsa approximation
+def calculate_ayanamsa(jd):
+    base_ayan = 23.853  # for J2000
+    rate_per_year = 50.2719 / 3600  # degrees per year
+    years = (np.asarray(jd, dtype=np.float64) - 2451545.0) / 365.25
+    return base_ayan + years * rate_per_year
+
+# Time-only part of the ascendant: mean sidereal time and obliquity, degrees
+def sidereal_time_obliquity(jd):
+    d = np.asarray(jd, dtype=np.float64) - 2451545.0
+    eps = 23.439281 - 0.0000004 * d
+    gmst = np.mod(280.46061837 + 360.98564736629 * d, 360)
+    return gmst, eps
+
+# Per-location part: the (y, x) arguments of the ascendant's atan2. Arguments
+# broadcast, so a grid can pass lat[:, None] and lon[None, :] and pay for
+# sin/cos per longitude and tan per latitude only.
+def ascendant_xy(gmst, eps, lat, lon):
+    lst = np.mod(gmst + np.asarray(lon) + 90, 360)  # Add 90 for adjustment
+    lst_rad = np.radians(lst)
+    eps_rad = np.radians(eps)
+    lat_rad = np.radians(lat)
+    y = np.sin(lst_rad)
+    x = np.cos(lst_rad) * np.cos(eps_rad) - np.sin(eps_rad) * np.tan(lat_rad)
+    return y, x
+
+def ascendant_angle(y, x):
+    asc_trop = np.degrees(np.arctan2(y, x))
+    return np.where(asc_trop < 0, asc_trop + 360, asc_trop)
+
+def calculate_ascendant(jd, lat, lon):
+    gmst, eps = sidereal_time_obliquity(jd)
+    return ascendant_angle(*ascendant_xy(gmst, eps, lat, lon))
+
+# Nakshatra, pada, rashi and paksha from longitudes, as in the Generate Description block
+def nakshatra_pada(sid_moon):
+    sid_moon = np.asarray(sid_moon, dtype=np.float64)
+    nak_num = np.floor(sid_moon / NAK_SPAN).astype(np.int64)
+    nak_rem = np.mod(sid_moon, NAK_SPAN)
+    pada = np.floor(nak_rem / PADA_SPAN).astype(np.int64) + 1
+    return nak_num, pada
+
+def rashi(sid_lon):
+    return np.floor(np.asarray(sid_lon, dtype=np.float64) / RASHI_SPAN).astype(np.int64)
+
+# True where the paksha is Shukla (waxing), False for Krishna
+def is_shukla(sun_long, moon_long):
+    elong = np.mod(np.asarray(moon_long) - np.asarray(sun_long), 360)
+    return elong < 180
+
+# Full chart for arrays of UTC datetime64 timestamps and birth coordinates
+# (pass an ephem_table.EphemerisTable as table to interpolate Sun/Moon instead,
+# or a precision tier other than "default" for the Moon and ascendant)
+def compute_charts(utc, lat, lon, table=None, tier="default"):
+    jd = julian_date_from_datetime64(np.asarray(utc, dtype="datetime64[m]"))
+    return compute_charts_jd(jd, lat, lon, table, tier)
+
+def compute_charts_jd(jd, lat, lon, table=None, tier="default"):
+    jd = np.asarray(jd, dtype=np.float64)
+    d = jd - 2451545.0
+    sun_long = table.sun_longitude_array(d) if table is not None else calculate_sun_longitude(d)
+    ayan = calculate_ayanamsa(jd)
+    if tier != "default":
+        import precision
+        moon_long, asc_trop = precision.moon_and_ascendant_array(jd, lat, lon, tier, sun_long, ayan)
+    else:
+        moon_long = table.moon_longitude_array(d) if table is not None else calculate_moon_longitude(d)
+        asc_trop = calculate_ascendant(jd, lat, lon)
+
+    sid_sun = np.mod(sun_long - ayan, 360)
+    sid_moon = np.mod(moon_long - ayan, 360)
+    sid_asc = np.mod(asc_trop - ayan, 360)
+    nak_num, pada = nakshatra_pada(sid_moon)
+    return {
+        "jd": jd,
+        "sun_long": sun_long,
+        "moon_long": moon_long,
+        "asc_trop": asc_trop,
+        "ayanamsa": ayan,
+        "sid_sun": sid_sun,
+        "sid_moon": sid_moon,
+        "sid_asc": sid_asc,
+        "nak_num": nak_num,
+        "pada": pada,
+        "rashi_num": rashi(sid_moon),
+        "sun_rashi_num": rashi(sid_sun),
+        "asc_rashi_num": rashi(sid_asc),
+        "shukla": is_shukla(sun_long, moon_long),
+    }
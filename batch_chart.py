@@ -0,0 +1,281 @@
+# batch_chart.py
+# Headless batch chart computation: streams CSV/Parquet rows of
+# (birth_date, birth_time, timezone, lat, lon) through a process pool and
+# writes one chart per row, in input order.
+#
+#   python batch_chart.py births.csv charts.csv --workers 8 --chunk-size 20000
+import argparse
+import collections
+import concurrent.futures
+import csv
+import datetime
+import functools
+import math
+import sys
+import time
+
+import astro_core
+
+INPUT_FIELDS = ["birth_date", "birth_time", "timezone", "lat", "lon"]
+OUTPUT_FIELDS = ["sun_rashi", "moon_rashi", "asc_rashi", "nakshatra", "pada", "paksha",
+                 "ruling_bird", "element", "string_type", "error"]
+
+@functools.lru_cache(maxsize=None)
+def known_zones():
+    return frozenset(astro_core.timezone_names())
+
+# Empty for a usable zone name, else the error message. Known names are a set
+# lookup; other names are remembered in a bounded cache, since the API passes
+# any string a client sends.
+def zone_error(name):
+    return "" if name in known_zones() else _zone_lookup_error(name)
+
+@functools.lru_cache(maxsize=1024)
+def _zone_lookup_error(name):
+    try:
+        astro_core.get_zone(name)
+    except (ValueError, astro_core.zoneinfo.ZoneInfoNotFoundError) as exc:
+        return f"{type(exc).__name__}: {exc}"
+    return ""
+
+# (lat, lon) of a row as floats; NaN, infinite and out-of-range values raise
+# ValueError like any other unparseable field
+def coordinates(row):
+    lat, lon = float(row["lat"]), float(row["lon"])
+    if not (math.isfinite(lat) and -90 <= lat <= 90):
+        raise ValueError(f"latitude out of range: {row['lat']!r}")
+    if not (math.isfinite(lon) and -180 <= lon <= 180):
+        raise ValueError(f"longitude out of range: {row['lon']!r}")
+    return lat, lon
+
+# Local times within a day of datetime's range can convert to a UTC instant
+# outside it
+EDGE_MIN = datetime.datetime.min + datetime.timedelta(days=1)
+EDGE_MAX = datetime.datetime.max - datetime.timedelta(days=1)
+
+# Julian dates for a chunk; rows that fail to parse get None and an error message.
+# With the numpy engine the timezone conversion runs per zone over the whole
+# chunk (tz_batch), otherwise row by row through astro_core.local_to_jd.
+def chunk_jds(rows, engine="scalar"):
+    jds, errors, parsed = [], [], []
+    for i, row in enumerate(rows):
+        try:
+            birth_date = datetime.date.fromisoformat(str(row["birth_date"]).strip())
+            birth_time = datetime.time.fromisoformat(str(row["birth_time"]).strip())
+            coordinates(row)
+            timezone = str(row["timezone"]).strip()
+            error = zone_error(timezone)
+            if error:
+                jds.append(None)
+                errors.append(error)
+                continue
+            local = datetime.datetime.combine(birth_date, birth_time)
+            if engine == "numpy" and EDGE_MIN < local < EDGE_MAX:
+                jds.append(None)
+                parsed.append((i, local, timezone))
+            else:
+                # Dates next to datetime's limits go through astimezone, which
+                # raises OverflowError when the UTC result falls outside them
+                jds.append(astro_core.local_to_jd(birth_date, birth_time, timezone))
+            errors.append("")
+        except (KeyError, ValueError, TypeError, OverflowError) as exc:
+            jds.append(None)
+            errors.append(f"{type(exc).__name__}: {exc}")
+    if parsed:
+        import numpy as np
+        import tz_batch
+        index, local, zones = zip(*parsed)
+        try:
+            converted = tz_batch.local_to_jd(np.array(local, dtype="datetime64[s]"), list(zones)).tolist()
+        except (ValueError, OverflowError):
+            # One bad row must not fail its whole zone group: convert row by row
+            converted = []
+            for dt, zone in zip(local, zones):
+                try:
+                    converted.append(float(tz_batch.local_to_jd(np.array([dt], dtype="datetime64[s]"), zone)[0]))
+                except (ValueError, OverflowError) as exc:
+                    converted.append(exc)
+        for i, jd in zip(index, converted):
+            if isinstance(jd, Exception):
+                errors[i] = f"{type(jd).__name__}: {jd}"
+            else:
+                jds[i] = jd
+    return jds, errors
+
+def compute_scalar(rows, jds):
+    charts = []
+    for row, jd in zip(rows, jds):
+        if jd is None:
+            charts.append(None)
+            continue
+        charts.append(astro_core.chart_numbers(jd, float(row["lat"]), float(row["lon"])))
+    return charts
+
+# astro_np.compute_charts_jd under the process's ephemeris backend and
+# precision tier, so array results classify like astro_core.chart_numbers
+def compute_arrays(jd, lat, lon):
+    astro_np = astro_core.numpy_engine()
+    table = astro_core.ephemeris_table() if astro_core.ephemeris_backend == "table" else None
+    if table is not None and not (table.covers(jd.min()) and table.covers(jd.max())):
+        table = None
+    return astro_np.compute_charts_jd(jd, lat, lon, table, astro_core.precision_tier)
+
+def compute_numpy(rows, jds):
+    import numpy as np
+
+    ok = [i for i, jd in enumerate(jds) if jd is not None]
+    charts = [None] * len(rows)
+    if not ok:
+        return charts
+    jd = np.array([jds[i] for i in ok])
+    lat = np.array([float(rows[i]["lat"]) for i in ok])
+    lon = np.array([float(rows[i]["lon"]) for i in ok])
+    res = compute_arrays(jd, lat, lon)
+    columns = [res[k].tolist() for k in ("nak_num", "pada", "rashi_num", "shukla", "sun_rashi_num", "asc_rashi_num")]
+    for i, (nak_num, pada, rashi_num, shukla, sun_rashi_num, asc_rashi_num) in zip(ok, zip(*columns)):
+        charts[i] = {
+            "nak_num": nak_num,
+            "pada": pada,
+            "rashi_num": rashi_num,
+            "paksha": "Shukla" if shukla else "Krishna",
+            "sun_rashi_num": sun_rashi_num,
+            "asc_rashi_num": asc_rashi_num,
+        }
+    return charts
+
+# Worker entry point: one chunk of input dicts in, one chunk of output dicts out.
+# ephemeris / precision of None keep the process's current settings.
+def process_chunk(rows, engine="numpy", ephemeris=None, precision=None):
+    if ephemeris is not None:
+        astro_core.set_ephemeris_backend(ephemeris)
+    if precision is not None:
+        astro_core.set_precision_tier(precision)
+    jds, errors = chunk_jds(rows, engine)
+    charts = compute_numpy(rows, jds) if engine == "numpy" else compute_scalar(rows, jds)
+    out = []
+    for row, chart, error in zip(rows, charts, errors):
+        result = {k: row.get(k) for k in INPUT_FIELDS}
+        if chart is None:
+            result.update({k: "" for k in OUTPUT_FIELDS})
+            result["error"] = error
+        else:
+            result.update(astro_core.chart_names(**chart))
+            result["error"] = ""
+        out.append(result)
+    return out
+
+def is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+def require_pyarrow():
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("Parquet input/output needs pyarrow: pip install pyarrow")
+    return pyarrow.parquet
+
+def read_chunks(path, chunk_size):
+    if is_parquet(path):
+        pq = require_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+    with open(path, newline="", encoding="utf-8") if path != "-" else sys.stdin as f:
+        reader = csv.DictReader(f)
+        missing = [k for k in INPUT_FIELDS if k not in (reader.fieldnames or [])]
+        if missing:
+            sys.exit(f"Input is missing columns: {', '.join(missing)}")
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+class CsvSink:
+    def __init__(self, path):
+        self.f = open(path, "w", newline="", encoding="utf-8") if path != "-" else sys.stdout
+        self.writer = csv.DictWriter(self.f, fieldnames=INPUT_FIELDS + OUTPUT_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        if self.f is not sys.stdout:
+            self.f.close()
+
+class ParquetSink:
+    def __init__(self, path):
+        import pyarrow
+        self.pa = pyarrow
+        self.pq = require_pyarrow()
+        self.path = path
+        self.writer = None
+        self.schema = pyarrow.schema([(k, pyarrow.string()) for k in INPUT_FIELDS + OUTPUT_FIELDS])
+
+    def write(self, rows):
+        columns = {k: [None if r[k] is None else str(r[k]) for r in rows] for k in self.schema.names}
+        table = self.pa.Table.from_pydict(columns, schema=self.schema)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+# Keep at most max_pending chunks in flight so memory stays bounded however
+# large the input is; results are yielded in submission (input) order.
+def run_pool(chunks, workers, engine, max_pending, ephemeris=None, precision=None):
+    if workers <= 1:
+        for chunk in chunks:
+            yield process_chunk(chunk, engine, ephemeris, precision)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(process_chunk, chunk, engine, ephemeris, precision))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def default_engine():
+    return "numpy" if astro_core.numpy_engine() is not None else "scalar"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute Vedic charts for a CSV/Parquet file of births.")
+    parser.add_argument("input", help="input .csv or .parquet file ('-' for CSV on stdin)")
+    parser.add_argument("output", help="output .csv or .parquet file ('-' for CSV on stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows per chunk (default 10000)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="chunks in flight at once (default 2 x workers)")
+    parser.add_argument("--engine", choices=["numpy", "scalar"], default=default_engine(),
+                        help="calculation engine (default numpy when installed)")
+    parser.add_argument("--ephemeris", choices=astro_core.EPHEMERIS_BACKENDS, default=astro_core.ephemeris_backend,
+                        help="Sun/Moon longitudes from the live formulas or the precomputed table")
+    parser.add_argument("--precision", choices=astro_core.PRECISION_TIERS, default=astro_core.precision_tier,
+                        help="Moon/ascendant precision tier (see precision.py)")
+    args = parser.parse_args(argv)
+
+    max_pending = args.max_pending or max(2 * args.workers, 1)
+    sink = ParquetSink(args.output) if is_parquet(args.output) else CsvSink(args.output)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for result in run_pool(read_chunks(args.input, args.chunk_size), args.workers, args.engine, max_pending,
+                               args.ephemeris, args.precision):
+            sink.write(result)
+            rows += len(result)
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"{rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
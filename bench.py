@@ -0,0 +1,337 @@
+# bench.py
+# Benchmarks and accuracy-regression checks for the chart calculations.
+# Runs offline with just the standard library (plus NumPy for batch timings).
+#
+#   python bench.py check                        # golden values + references, exit 1 on failure
+#   python bench.py run --out bench/latest.json  # timings for sizes 1..10^6
+#   python bench.py compare old.json new.json    # per-case speed ratios
+#   python bench.py golden --write               # re-record golden values after an intended change
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import astro_core
+from astro_core import (
+    julian_date, calculate_sun_longitude, calculate_moon_longitude, calculate_ayanamsa,
+    calculate_ascendant, chart_numbers, chart_names,
+)
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_values.json")
+GOLDEN_TOL = 1e-9
+
+# Calendar dates that exercise the Julian Date branches: Gregorian cutover,
+# January/February (year shifted back), leap days and the ends of the UI range
+GOLDEN_DATES = [
+    (1582, 10, 4, 0, 0), (1582, 10, 15, 0, 0), (1600, 2, 29, 12, 0),
+    (1900, 1, 1, 0, 0), (1900, 2, 28, 23, 59), (1900, 3, 1, 0, 0),
+    (1947, 8, 15, 0, 0), (1969, 7, 20, 20, 17), (1990, 5, 17, 9, 0),
+    (2000, 1, 1, 12, 0), (2000, 2, 29, 6, 30), (2000, 3, 1, 0, 0),
+    (2024, 1, 31, 18, 45), (2024, 2, 1, 5, 15), (2050, 6, 21, 0, 0),
+    (2100, 1, 1, 0, 0), (2100, 2, 28, 12, 0), (2100, 3, 1, 0, 0), (2100, 12, 31, 23, 59),
+]
+# Extreme latitudes stress tan(lat) in the ascendant
+GOLDEN_LATS = [-89.99, -89.5, -66.56, -45.0, 0.0, 12.97, 45.0, 66.56, 89.5, 89.99]
+GOLDEN_LONS = [-179.99, -73.94, 0.0, 77.59, 179.99]
+
+# Published values (Meeus, Astronomical Algorithms) with the tolerance the
+# simplified formulas meet. The Sun tolerance is wide because the series is
+# evaluated from J2000.0 while its constants are for 2000 Jan 0.0, 1.5 days
+# earlier, which shifts the Sun by about 1.5 degrees.
+REFERENCES = [
+    ("julian_date 1957-10-04.81", lambda: julian_date(1957, 10, 4, 19, 26, 24), 2436116.31, 1e-6),
+    ("julian_date 333-01-27 12h (Julian)", lambda: julian_date(333, 1, 27, 12), 1842713.0, 1e-9),
+    ("julian_date 2000-01-01 12h", lambda: julian_date(2000, 1, 1, 12), 2451545.0, 1e-9),
+    ("julian_date 1987-01-27", lambda: julian_date(1987, 1, 27), 2446822.5, 1e-9),
+    ("julian_date 1988-06-19 12h", lambda: julian_date(1988, 6, 19, 12), 2447332.0, 1e-9),
+    ("julian_date 1600-01-01", lambda: julian_date(1600, 1, 1), 2305447.5, 1e-9),
+    ("sun 1992-10-13 0h", lambda: calculate_sun_longitude(2448908.5 - 2451545.0), 199.90988, 1.6),
+    ("moon 1992-04-12 0h", lambda: calculate_moon_longitude(2448724.5 - 2451545.0), 133.162655, 0.1),
+    ("ayanamsa 2000-01-01 12h", lambda: calculate_ayanamsa(2451545.0), 23.853, 1e-9),
+    ("ayanamsa 1900-01-01", lambda: calculate_ayanamsa(julian_date(1900, 1, 1)), 22.46, 0.01),
+]
+
+def angle_diff(a, b):
+    return abs((a - b + 180) % 360 - 180)
+
+# Golden charts are recorded with the formula backend at the default tier,
+# whatever ASTRO_EPHEMERIS / ASTRO_PRECISION the caller has set
+@contextlib.contextmanager
+def reference_settings():
+    backend, tier = astro_core.ephemeris_backend, astro_core.precision_tier
+    astro_core.set_ephemeris_backend("formula")
+    astro_core.set_precision_tier("default")
+    try:
+        yield
+    finally:
+        astro_core.set_ephemeris_backend(backend)
+        astro_core.set_precision_tier(tier)
+
+def golden_cases():
+    with reference_settings():
+        return _golden_cases()
+
+def _golden_cases():
+    cases = []
+    for date in GOLDEN_DATES:
+        jd = julian_date(*date)
+        d = jd - 2451545.0
+        case = {
+            "date": list(date),
+            "jd": jd,
+            "sun": calculate_sun_longitude(d),
+            "moon": calculate_moon_longitude(d),
+            "ayanamsa": calculate_ayanamsa(jd),
+            "ascendant": [[lat, lon, calculate_ascendant(jd, lat, lon)] for lat in GOLDEN_LATS for lon in GOLDEN_LONS],
+            "chart": chart_names(**chart_numbers(jd, 12.97, 77.59)),
+        }
+        cases.append(case)
+    return cases
+
+def check_golden(path=GOLDEN_PATH):
+    with open(path, encoding="utf-8") as f:
+        expected = json.load(f)
+    failures = []
+    for want, got in zip(expected, golden_cases()):
+        label = "-".join(str(x) for x in want["date"])
+        if abs(want["jd"] - got["jd"]) > GOLDEN_TOL:
+            failures.append(f"{label} jd {got['jd']} != {want['jd']}")
+        for key in ("sun", "moon", "ayanamsa"):
+            if angle_diff(want[key], got[key]) > GOLDEN_TOL:
+                failures.append(f"{label} {key} {got[key]} != {want[key]}")
+        for (lat, lon, asc_want), (_, _, asc_got) in zip(want["ascendant"], got["ascendant"]):
+            if angle_diff(asc_want, asc_got) > GOLDEN_TOL:
+                failures.append(f"{label} ascendant at {lat},{lon} {asc_got} != {asc_want}")
+        if want["chart"] != got["chart"]:
+            failures.append(f"{label} chart {got['chart']} != {want['chart']}")
+    if len(expected) != len(GOLDEN_DATES):
+        failures.append(f"golden file has {len(expected)} cases, expected {len(GOLDEN_DATES)}")
+    return failures
+
+def check_references():
+    failures = []
+    for label, compute, expected, tol in REFERENCES:
+        got = compute()
+        err = angle_diff(got, expected) if expected < 400 else abs(got - expected)
+        if err > tol:
+            failures.append(f"{label}: {got} differs from {expected} by {err:.6g} (tolerance {tol})")
+    return failures
+
+# The NumPy engine must agree with the scalar functions across 1900-2100
+def check_numpy(samples=20000, seed=0):
+    astro_np = astro_core.numpy_engine()
+    if astro_np is None:
+        return []
+    import numpy as np
+    rng = random.Random(seed)
+    rows = [(rng.randint(1900, 2100), rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23),
+             rng.randint(0, 59), rng.uniform(-89.99, 89.99), rng.uniform(-180, 180)) for _ in range(samples)]
+    year, month, day, hour, minute, lat, lon = (np.array(col) for col in zip(*rows))
+    jd_scalar = np.array([julian_date(*row[:5]) for row in rows])
+    d = jd_scalar - 2451545.0
+    pairs = [
+        ("julian_date", astro_np.julian_date(year, month, day, hour, minute), jd_scalar),
+        ("sun", astro_np.calculate_sun_longitude(d), np.array([calculate_sun_longitude(x) for x in d])),
+        ("moon", astro_np.calculate_moon_longitude(d), np.array([calculate_moon_longitude(x) for x in d])),
+        ("ayanamsa", astro_np.calculate_ayanamsa(jd_scalar), np.array([calculate_ayanamsa(x) for x in jd_scalar])),
+        ("ascendant", astro_np.calculate_ascendant(jd_scalar, lat, lon),
+         np.array([calculate_ascendant(*args) for args in zip(jd_scalar, lat, lon)])),
+    ]
+    failures = []
+    for name, vec, scalar in pairs:
+        err = float(np.abs(np.mod(vec - scalar + 180, 360) - 180).max())
+        if err > 1e-9:
+            failures.append(f"numpy {name} differs from scalar by {err:.3g}")
+    return failures
+
+def cmd_check(args):
+    failures = check_golden(args.golden) + check_references() + check_numpy()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("All accuracy checks passed" if not failures else f"{len(failures)} accuracy checks failed")
+    return 1 if failures else 0
+
+def cmd_golden(args):
+    cases = golden_cases()
+    if args.write:
+        with open(args.golden, "w", encoding="utf-8") as f:
+            json.dump(cases, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+        print(f"Wrote {len(cases)} golden cases to {args.golden}")
+    else:
+        print(json.dumps(cases[:1], indent=1, ensure_ascii=False))
+    return 0
+
+# Best-of-`repeat` seconds for one call of fn, looping small cases for stable timings
+def best_time(fn, repeat=3, min_seconds=0.1):
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or loops >= 1 << 20:
+            break
+        # Jump straight to roughly min_seconds worth of loops
+        loops = min(loops * 100, int(loops * 1.2 * min_seconds / max(elapsed, 1e-6)) + 1)
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+def random_inputs(n, seed=0):
+    rng = random.Random(seed)
+    jds = [rng.uniform(2415020.5, 2488069.5) for _ in range(n)]
+    lats = [rng.uniform(-66, 66) for _ in range(n)]
+    lons = [rng.uniform(-180, 180) for _ in range(n)]
+    return jds, lats, lons
+
+def random_rows(n, seed=0):
+    rng = random.Random(seed)
+    zones = ["UTC", "Asia/Kolkata", "America/New_York", "Europe/London", "Australia/Sydney"]
+    return [{
+        "birth_date": f"{rng.randint(1900, 2100)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "birth_time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+        "timezone": rng.choice(zones),
+        "lat": rng.uniform(-66, 66),
+        "lon": rng.uniform(-180, 180),
+    } for _ in range(n)]
+
+def scalar_cases(jds, lats, lons):
+    ds = [jd - 2451545.0 for jd in jds]
+    dates = [datetime.datetime(2000, 1, 1) + datetime.timedelta(days=d) for d in ds]
+    return {
+        "julian_date": lambda: [julian_date(t.year, t.month, t.day, t.hour, t.minute) for t in dates],
+        "sun_longitude": lambda: [calculate_sun_longitude(d) for d in ds],
+        "moon_longitude": lambda: [calculate_moon_longitude(d) for d in ds],
+        "ayanamsa": lambda: [calculate_ayanamsa(jd) for jd in jds],
+        "ascendant": lambda: [calculate_ascendant(*args) for args in zip(jds, lats, lons)],
+        "chart": lambda: [chart_names(**chart_numbers(*args)) for args in zip(jds, lats, lons)],
+    }
+
+def batch_cases(astro_np, jds, lats, lons):
+    import numpy as np
+    jd = np.array(jds)
+    d = jd - 2451545.0
+    lat, lon = np.array(lats), np.array(lons)
+    utc = (np.datetime64("2000-01-01T12:00") + (d * 1440).astype("timedelta64[m]"))
+    fields = astro_np.split_datetime64(utc)
+    return {
+        "julian_date": lambda: astro_np.julian_date(*fields),
+        "sun_longitude": lambda: astro_np.calculate_sun_longitude(d),
+        "moon_longitude": lambda: astro_np.calculate_moon_longitude(d),
+        "ayanamsa": lambda: astro_np.calculate_ayanamsa(jd),
+        "ascendant": lambda: astro_np.calculate_ascendant(jd, lat, lon),
+        "chart": lambda: astro_np.compute_charts_jd(jd, lat, lon),
+    }
+
+# Cold-start cost of `import astro_core` in a fresh interpreter, net of startup
+def import_time_ms(repeat=5):
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(GOLDEN_PATH))
+        return time.perf_counter() - start
+    base = min(run("pass") for _ in range(repeat))
+    return 1000 * (min(run("import astro_core") for _ in range(repeat)) - base)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(GOLDEN_PATH)).stdout.strip() or None
+    except OSError:
+        return None
+
+def cmd_run(args):
+    import batch_chart
+    sizes = [10 ** k for k in range(7) if 10 ** k <= args.max_size]
+    astro_np = astro_core.numpy_engine()
+    results = []
+
+    def record(name, mode, size, seconds):
+        results.append({"name": name, "mode": mode, "size": size, "seconds": seconds,
+                        "us_per_item": 1e6 * seconds / size})
+        print(f"{name:<15} {mode:<7} {size:>8}  {1e6 * seconds / size:10.3f} us/item", flush=True)
+
+    for size in sizes:
+        jds, lats, lons = random_inputs(size)
+        if size <= args.max_scalar_size:
+            for name, fn in scalar_cases(jds, lats, lons).items():
+                record(name, "scalar", size, best_time(fn, repeat=1 if size >= 10 ** 5 else 3))
+        if astro_np is not None:
+            for name, fn in batch_cases(astro_np, jds, lats, lons).items():
+                record(name, "batch", size, best_time(fn, repeat=1 if size >= 10 ** 5 else 3))
+        # End to end, from local date/time/timezone rows to named charts
+        rows = random_rows(size)
+        for engine in ("scalar", "numpy"):
+            if engine == "scalar" and size > args.max_scalar_size or engine == "numpy" and astro_np is None:
+                continue
+            record("pipeline", engine, size, best_time(lambda: batch_chart.process_chunk(rows, engine), repeat=1))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "numpy": getattr(sys.modules.get("numpy"), "__version__", None),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "import_ms": import_time_ms(),
+        "results": results,
+    }
+    print(f"import astro_core: {report['import_ms']:.1f} ms")
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        print(f"Wrote {args.out}")
+    return 0
+
+def cmd_compare(args):
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    before = {(r["name"], r["mode"], r["size"]): r["seconds"] for r in old["results"]}
+    slower = 0
+    for r in new["results"]:
+        key = (r["name"], r["mode"], r["size"])
+        if key not in before:
+            continue
+        ratio = r["seconds"] / before[key]
+        flag = "  SLOWER" if ratio > args.threshold else ""
+        slower += bool(flag)
+        print(f"{r['name']:<15} {r['mode']:<7} {r['size']:>8}  {ratio:6.2f}x{flag}")
+    print(f"import astro_core: {old['import_ms']:.1f} -> {new['import_ms']:.1f} ms")
+    return 1 if slower else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark and accuracy checks for the chart calculations.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("check", help="golden-value, reference and scalar/NumPy agreement checks")
+    p.add_argument("--golden", default=GOLDEN_PATH)
+    p = sub.add_parser("golden", help="show or re-record golden values")
+    p.add_argument("--golden", default=GOLDEN_PATH)
+    p.add_argument("--write", action="store_true")
+    p = sub.add_parser("run", help="time every function, scalar and batch")
+    p.add_argument("--out", help="write results as JSON")
+    p.add_argument("--max-size", type=int, default=10 ** 6)
+    p.add_argument("--max-scalar-size", type=int, default=10 ** 6)
+    p = sub.add_parser("compare", help="compare two `run` result files")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=1.2, help="ratio reported as a slowdown")
+    args = parser.parse_args(argv)
+    return {"check": cmd_check, "golden": cmd_golden, "run": cmd_run, "compare": cmd_compare}[args.command](args)
+
+if __name__ == "__main__":
+    sys.exit(main())
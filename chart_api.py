@@ -0,0 +1,242 @@
+# chart_api.py
+# Asyncio JSON chart service. Concurrent requests are queued and coalesced
+# into micro-batches (up to --max-batch charts, or whatever arrived within
+# --window-ms of the first one) which are evaluated together by the same
+# batch code batch_chart.py uses.
+#
+#   python chart_api.py --port 8080 --window-ms 2 --max-batch 256
+#   curl -d '{"birth_date": "1990-05-17", "birth_time": "14:30",
+#             "timezone": "Asia/Kolkata", "lat": 12.97, "lon": 77.59}' localhost:8080/chart
+#   curl localhost:8080/stats
+#
+# A full queue (--queue-size) is answered with 503 so clients back off
+# instead of piling up latency.
+import argparse
+import asyncio
+import collections
+import json
+import time
+
+import astro_core
+import batch_chart
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+MAX_BODY = 1 << 16
+
+# Results for a micro-batch. If the batch as a whole raises, each row is re-run
+# on its own so one bad row only fails itself; its slot then holds the exception.
+def process_rows(rows, engine):
+    try:
+        return batch_chart.process_chunk(rows, engine)
+    except Exception:
+        results = []
+        for row in rows:
+            try:
+                results.append(batch_chart.process_chunk([row], engine)[0])
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+class ChartBatcher:
+    def __init__(self, window=0.002, max_batch=256, queue_size=10000, engine=None):
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.engine = engine or batch_chart.default_engine()
+        self.latencies = collections.deque(maxlen=10000)
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.started = time.monotonic()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    # Raises asyncio.QueueFull when the service is saturated
+    async def submit(self, row):
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((row, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Anything already queued rides along for free
+        while len(batch) < self.max_batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            rows = [item[0] for item in batch]
+            # Off the event loop so new requests keep being accepted meanwhile
+            results = await loop.run_in_executor(None, process_rows, rows, self.engine)
+            self.batches += 1
+            now = time.perf_counter()
+            for (_, future, queued), result in zip(batch, results):
+                self.latencies.append(now - queued)
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        elapsed = time.monotonic() - self.started
+        return {
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "queue_depth": self.queue.qsize(),
+            "requests_per_sec": self.requests / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {f"p{int(q * 100)}": 1000 * percentile(latencies, q) for q in (0.5, 0.9, 0.99)},
+        }
+
+def chart_response(result):
+    if result["error"]:
+        return 400, {"error": result["error"]}
+    names = {k: result[k] for k in batch_chart.OUTPUT_FIELDS if k != "error"}
+    names.update(astro_core.chart_descriptions(names))
+    return 200, names
+
+async def handle_request(batcher, method, path, body):
+    if path == "/stats":
+        return 200, batcher.stats()
+    if path != "/chart":
+        return 404, {"error": f"unknown path {path}"}
+    if method != "POST":
+        return 405, {"error": "POST a JSON object to /chart"}
+    try:
+        row = json.loads(body)
+    except ValueError as exc:
+        return 400, {"error": f"invalid JSON: {exc}"}
+    if not isinstance(row, dict):
+        return 400, {"error": "expected a JSON object"}
+    missing = [k for k in batch_chart.INPUT_FIELDS if k not in row]
+    if missing:
+        return 400, {"error": f"missing fields: {', '.join(missing)}"}
+    try:
+        batch_chart.coordinates(row)
+    except (ValueError, TypeError) as exc:
+        return 400, {"error": f"{type(exc).__name__}: {exc}"}
+    try:
+        result = await batcher.submit(row)
+    except asyncio.QueueFull:
+        batcher.rejected += 1
+        return 503, {"error": "server busy, retry later"}
+    except Exception as exc:
+        return 500, {"error": f"{type(exc).__name__}: {exc}"}
+    batcher.requests += 1
+    return chart_response(result)
+
+async def write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            + ("Retry-After: 1\r\n" if status == 503 else "") + "\r\n")
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+# Minimal HTTP/1.1 with keep-alive: enough for JSON clients and the load generator
+async def serve_connection(batcher, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, path, version = request_line.decode("latin-1").split()
+            except ValueError:
+                await write_response(writer, 400, {"error": "malformed request line"}, False)
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get("content-length", 0) or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                await write_response(writer, 400, {"error": "invalid Content-Length"}, False)
+                break
+            if length > MAX_BODY:
+                await write_response(writer, 413, {"error": "request body too large"}, False)
+                break
+            body = await reader.readexactly(length) if length else b""
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            status, payload = await handle_request(batcher, method, path.split("?")[0], body)
+            await write_response(writer, status, payload, keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host, port, batcher):
+    batcher.start()
+    server = await asyncio.start_server(lambda r, w: serve_connection(batcher, r, w), host, port)
+    print(f"Serving charts on http://{host}:{port} (window {batcher.window * 1000:g} ms, "
+          f"max batch {batcher.max_batch}, engine {batcher.engine}, ephemeris {astro_core.ephemeris_backend}, "
+          f"precision {astro_core.precision_tier})")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Vedic charts as JSON over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--window-ms", type=float, default=2.0, help="micro-batch collection window")
+    parser.add_argument("--max-batch", type=int, default=256, help="largest batch evaluated at once")
+    parser.add_argument("--queue-size", type=int, default=10000, help="pending requests before 503s")
+    parser.add_argument("--engine", choices=["numpy", "scalar"], default=batch_chart.default_engine())
+    parser.add_argument("--ephemeris", choices=astro_core.EPHEMERIS_BACKENDS, default=astro_core.ephemeris_backend,
+                        help="Sun/Moon longitudes from the live formulas or the precomputed table")
+    parser.add_argument("--precision", choices=astro_core.PRECISION_TIERS, default=astro_core.precision_tier,
+                        help="Moon/ascendant precision tier (see precision.py)")
+    args = parser.parse_args(argv)
+    # Batches run in this process's executor threads, so the module settings apply to all of them
+    astro_core.set_ephemeris_backend(args.ephemeris)
+    astro_core.set_precision_tier(args.precision)
+
+    async def run():
+        batcher = ChartBatcher(args.window_ms / 1000, args.max_batch, args.queue_size, args.engine)
+        await serve(args.host, args.port, batcher)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# chart_cache.py
+# Two-level cache for computed charts: a bounded in-process LRU in front of an
+# on-disk SQLite store shared by every server process.
+#
+# Keys are the UTC minute plus latitude/longitude rounded to `precision`
+# decimal places; charts are computed at the rounded coordinates so a cached
+# value never depends on which caller filled it. Only the ascendant depends on
+# location, and 2 places (~1 km) moves it by far less than a degree.
+#
+#   python chart_cache.py warm common_births.csv
+#   python chart_cache.py stats
+import argparse
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import astro_core
+
+DEFAULT_PATH = os.environ.get(
+    "ASTRO_CHART_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "astro-fun-app", "charts.sqlite3"),
+)
+
+class ChartCache:
+    def __init__(self, path=DEFAULT_PATH, max_memory_entries=10000, max_db_entries=1000000,
+                 ttl=None, precision=2):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_db_entries = max_db_entries
+        self.ttl = ttl
+        self.precision = precision
+        self.hits_memory = 0
+        self.hits_db = 0
+        self.misses = 0
+        self._lru = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self._writes = 0
+
+    def key(self, jd, lat, lon):
+        minute = round((jd - 2440587.5) * 1440)
+        key = f"{minute}:{round(lat, self.precision):.{self.precision}f}:{round(lon, self.precision):.{self.precision}f}"
+        # Charts from the other precision tiers or from the ephemeris table never
+        # share entries with the default formula charts. Only the default tier
+        # reads the ephemeris backend, so the other tiers are keyed by tier alone.
+        tier = astro_core.precision_tier
+        if tier != "default":
+            return f"{tier}:{key}"
+        backend = astro_core.ephemeris_backend
+        return key if backend == "formula" else f"{backend}:{key}"
+
+    # One connection per process; a forked worker must not reuse its parent's
+    def _conn(self):
+        if self.path is None:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS charts (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS charts_created ON charts (created)")
+            self._db, self._db_pid = db, os.getpid()
+        return self._db
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key, value, created):
+        self._lru[key] = (value, created)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_memory_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, jd, lat, lon):
+        key = self.key(jd, lat, lon)
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and not self._expired(entry[1], now):
+                self._lru.move_to_end(key)
+                self.hits_memory += 1
+                return entry[0]
+            db = self._conn()
+            if db is not None:
+                row = db.execute("SELECT value, created FROM charts WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.hits_db += 1
+                    return value
+            self.misses += 1
+        return None
+
+    def put(self, jd, lat, lon, value):
+        key = self.key(jd, lat, lon)
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            db = self._conn()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO charts (key, value, created) VALUES (?, ?, ?)",
+                           (key, json.dumps(value), now))
+                self._writes += 1
+                # Evict in batches rather than on every write
+                if self._writes % 1000 == 0:
+                    self._evict(db, now)
+
+    def _evict(self, db, now):
+        if self.ttl is not None:
+            db.execute("DELETE FROM charts WHERE created < ?", (now - self.ttl,))
+        count = db.execute("SELECT COUNT(*) FROM charts").fetchone()[0]
+        if count > self.max_db_entries:
+            db.execute("DELETE FROM charts WHERE key IN (SELECT key FROM charts ORDER BY created LIMIT ?)",
+                       (count - self.max_db_entries,))
+
+    def evict(self):
+        with self._lock:
+            db = self._conn()
+            if db is not None:
+                self._evict(db, time.time())
+
+    # Cached astro_core.chart_numbers, computed at the quantized coordinates
+    def chart_numbers(self, jd, lat, lon):
+        chart = self.get(jd, lat, lon)
+        if chart is None:
+            chart = astro_core.chart_numbers(jd, round(lat, self.precision), round(lon, self.precision))
+            self.put(jd, lat, lon, chart)
+        return chart
+
+    # Entries held in memory (stats() also counts the SQLite store)
+    def __len__(self):
+        return len(self._lru)
+
+    def stats(self):
+        lookups = self.hits_memory + self.hits_db + self.misses
+        stats = {
+            "hits_memory": self.hits_memory,
+            "hits_db": self.hits_db,
+            "misses": self.misses,
+            "hit_rate": (self.hits_memory + self.hits_db) / lookups if lookups else 0.0,
+            "memory_entries": len(self._lru),
+        }
+        db = self._conn()
+        if db is not None:
+            with self._lock:
+                stats["db_entries"] = db.execute("SELECT COUNT(*) FROM charts").fetchone()[0]
+        return stats
+
+    # Fill the cache from a CSV/Parquet file in batch_chart.py's input format
+    def warm(self, path, chunk_size=10000):
+        import batch_chart
+        added = 0
+        for rows in batch_chart.read_chunks(path, chunk_size):
+            jds, _ = batch_chart.chunk_jds(rows)
+            for row, jd in zip(rows, jds):
+                if jd is None:
+                    continue
+                lat, lon = float(row["lat"]), float(row["lon"])
+                if self.get(jd, lat, lon) is None:
+                    self.put(jd, lat, lon, astro_core.chart_numbers(jd, round(lat, self.precision),
+                                                                    round(lon, self.precision)))
+                    added += 1
+        self.evict()
+        return added
+
+    def close(self):
+        if self._db is not None and self._db_pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm or inspect the shared chart cache.")
+    parser.add_argument("command", choices=["warm", "stats", "evict"])
+    parser.add_argument("input", nargs="?", help="CSV/Parquet of common inputs (for warm)")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="SQLite cache path")
+    parser.add_argument("--precision", type=int, default=2, help="decimal places kept for lat/lon")
+    parser.add_argument("--ttl", type=float, default=None, help="entry lifetime in seconds")
+    parser.add_argument("--max-entries", type=int, default=1000000, help="SQLite size limit in entries")
+    args = parser.parse_args(argv)
+
+    cache = ChartCache(args.db, max_db_entries=args.max_entries, ttl=args.ttl, precision=args.precision)
+    if args.command == "warm":
+        if not args.input:
+            parser.error("warm needs an input file")
+        print(f"Added {cache.warm(args.input)} charts")
+    elif args.command == "evict":
+        cache.evict()
+    print(json.dumps(cache.stats()))
+    cache.close()
+
+if __name__ == "__main__":
+    main()
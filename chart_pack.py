@@ -0,0 +1,140 @@
+# chart_pack.py
+# Packed charts. Every chart field is a small integer: a single chart is a
+# PackedChart (__slots__, no per-instance dict) and a population is a NumPy
+# structured array of chart_dtype(), 6 bytes per chart. The bird, element and
+# string type follow from (paksha, nakshatra) and every name, trait and
+# description is a lookup by index into the tables below, precomputed once
+# from astro_core, so nothing is rebuilt per chart.
+#
+#   chart = PackedChart.from_numbers(astro_core.chart_numbers(jd, lat, lon))
+#   chart.names()                      # same dict as astro_core.chart_names
+#   charts = pack_arrays(astro_np.compute_charts_jd(jd, lat, lon))
+import astro_core
+
+PAKSHAS = astro_core.PAKSHAS
+BIRDS = list(astro_core.bird_to_element)
+ELEMENTS = list(astro_core.element_to_string)
+STRING_TYPES = [astro_core.element_to_string[e] for e in ELEMENTS]
+
+# BIRD_OF[paksha][nak_num] -> bird index
+BIRD_OF = [[BIRDS.index(astro_core.ruling_bird(nak, paksha)) for nak in astro_core.nakshatras] for paksha in PAKSHAS]
+ELEMENT_OF_BIRD = [ELEMENTS.index(astro_core.bird_to_element[b]) for b in BIRDS]
+# ELEMENT_OF[paksha][nak_num] -> element index
+ELEMENT_OF = [[ELEMENT_OF_BIRD[b] for b in row] for row in BIRD_OF]
+# RASHI_ELEMENT[rashi_num] -> element index (the four classical elements)
+RASHI_ELEMENT = [ELEMENTS.index(astro_core.rashi_elements[r]) for r in astro_core.rashis]
+
+# Text tables indexed by rashi, nakshatra, bird and element number
+SUN_DESC = [astro_core.descriptions[r]["sun"] for r in astro_core.rashis]
+MOON_DESC = [astro_core.descriptions[r]["moon"] for r in astro_core.rashis]
+ASC_DESC = [astro_core.descriptions[r]["asc"] for r in astro_core.rashis]
+RASHI_TRAIT = [astro_core.rashi_traits[r] for r in astro_core.rashis]
+NAK_TRAIT = [astro_core.nak_traits[n] for n in astro_core.nakshatras]
+BIRD_SANSKRIT = [astro_core.bird_to_sanskrit[b] for b in BIRDS]
+BIRD_DESC = [astro_core.bird_descriptions[b] for b in BIRDS]
+STRING_DESC = [astro_core.string_descriptions[s] for s in STRING_TYPES]
+
+FIELDS = ("nak_num", "pada", "rashi_num", "paksha", "sun_rashi_num", "asc_rashi_num")
+
+class PackedChart:
+    __slots__ = FIELDS
+
+    def __init__(self, nak_num, pada, rashi_num, paksha, sun_rashi_num, asc_rashi_num):
+        self.nak_num = nak_num
+        self.pada = pada
+        self.rashi_num = rashi_num
+        self.paksha = paksha  # 0 Shukla, 1 Krishna
+        self.sun_rashi_num = sun_rashi_num
+        self.asc_rashi_num = asc_rashi_num
+
+    # From an astro_core.chart_numbers dict
+    @classmethod
+    def from_numbers(cls, chart):
+        return cls(chart["nak_num"], chart["pada"], chart["rashi_num"], PAKSHAS.index(chart["paksha"]),
+                   chart["sun_rashi_num"], chart["asc_rashi_num"])
+
+    # Row of a chart_dtype() array
+    @classmethod
+    def from_record(cls, record):
+        return cls(*(int(record[f]) for f in FIELDS))
+
+    def __eq__(self, other):
+        return isinstance(other, PackedChart) and all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    def __repr__(self):
+        return "PackedChart(" + ", ".join(f"{f}={getattr(self, f)}" for f in FIELDS) + ")"
+
+    @property
+    def bird(self):
+        return BIRD_OF[self.paksha][self.nak_num]
+
+    @property
+    def element(self):
+        return ELEMENT_OF[self.paksha][self.nak_num]
+
+    # Inverse of from_numbers
+    def numbers(self):
+        return {
+            "nak_num": self.nak_num,
+            "pada": self.pada,
+            "rashi_num": self.rashi_num,
+            "paksha": PAKSHAS[self.paksha],
+            "sun_rashi_num": self.sun_rashi_num,
+            "asc_rashi_num": self.asc_rashi_num,
+        }
+
+    # Same result as astro_core.chart_names(**self.numbers())
+    def names(self):
+        element = self.element
+        return {
+            "sun_rashi": astro_core.rashis[self.sun_rashi_num],
+            "moon_rashi": astro_core.rashis[self.rashi_num],
+            "asc_rashi": astro_core.rashis[self.asc_rashi_num],
+            "nakshatra": astro_core.nakshatras[self.nak_num],
+            "pada": self.pada,
+            "paksha": PAKSHAS[self.paksha],
+            "ruling_bird": BIRDS[self.bird],
+            "element": ELEMENTS[element],
+            "string_type": STRING_TYPES[element],
+        }
+
+    # Same result as astro_core.chart_descriptions(self.names())
+    def descriptions(self):
+        bird = self.bird
+        return {
+            "sun_desc": SUN_DESC[self.sun_rashi_num],
+            "moon_desc": MOON_DESC[self.rashi_num],
+            "asc_desc": ASC_DESC[self.asc_rashi_num],
+            "sanskrit_name": BIRD_SANSKRIT[bird],
+            "bird_desc": BIRD_DESC[bird],
+            "string_desc": STRING_DESC[ELEMENT_OF_BIRD[bird]],
+            "rashi_trait": RASHI_TRAIT[self.rashi_num],
+            "nak_trait": NAK_TRAIT[self.nak_num],
+        }
+
+# Population arrays; NumPy is imported on first use like the rest of the batch code
+def chart_dtype():
+    import numpy as np
+    return np.dtype([(f, "u1") for f in FIELDS])
+
+# astro_np.compute_charts_jd result -> chart_dtype() array
+def pack_arrays(res):
+    import numpy as np
+    charts = np.empty(len(res["nak_num"]), dtype=chart_dtype())
+    for f in ("nak_num", "pada", "rashi_num", "sun_rashi_num", "asc_rashi_num"):
+        charts[f] = res[f]
+    charts["paksha"] = np.where(res["shukla"], 0, 1)
+    return charts
+
+# List of PackedChart -> chart_dtype() array
+def pack_records(records):
+    import numpy as np
+    return np.array([tuple(getattr(r, f) for f in FIELDS) for r in records], dtype=chart_dtype())
+
+def bird_array(charts):
+    import numpy as np
+    return np.asarray(BIRD_OF, dtype=np.uint8)[charts["paksha"], charts["nak_num"]]
+
+def element_array(charts):
+    import numpy as np
+    return np.asarray(ELEMENT_OF, dtype=np.uint8)[charts["paksha"], charts["nak_num"]]
@@ -0,0 +1,265 @@
+# compatibility.py
+# Compatibility search over a population of packed charts (chart_pack.py).
+#
+# The score of a pair only depends on the two nakshatras, the two Moon rashis
+# and the two Pancha Pakshi elements, so it is the sum of three precomputed
+# symmetric tables:
+#   NAK_SCORE 27x27      Tara (0-3), Gana (0-6) and Nadi (0 or 8) kootas
+#   RASHI_SCORE 12x12    Bhakoot (0 or 7) plus Moon-sign element harmony (0-2)
+#   ELEMENT_SCORE 5x5    harmony of the ruling birds' elements (0-4)
+# for a maximum of 30. The index sorts the population once by
+# (nakshatra, rashi, element) cell, with at most 27 x 12 x 5 cells. A query
+# scores every non-empty cell with three table gathers, then takes chart ids
+# from the best cells down until it has k. The cost depends on the number of
+# cells and on k, not on the population size.
+#
+#   python compatibility.py build births.csv population.npz
+#   python compatibility.py match population.npz 1990-05-17 14:30 Asia/Kolkata 12.97 77.59 --top 10
+#   python compatibility.py check --size 1000000
+import argparse
+import heapq
+import sys
+import time
+
+import numpy as np
+
+import astro_core
+import astro_np
+import chart_pack
+
+N_NAK, N_RASHI, N_ELEMENT = 27, 12, len(chart_pack.ELEMENTS)
+N_CELLS = N_NAK * N_RASHI * N_ELEMENT
+
+# Gana of each nakshatra: 0 Deva, 1 Manushya, 2 Rakshasa
+GANA = [0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2, 0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0]
+GANA_POINTS = [[6, 5, 1], [5, 6, 0], [1, 0, 6]]
+# Nadi runs Aadi, Madhya, Antya, Antya, Madhya, Aadi through the nakshatras
+NADI = [(0, 1, 2, 2, 1, 0)[n % 6] for n in range(N_NAK)]
+
+def _tara(a, b):
+    # Counting from a's nakshatra to b's, remainders 3, 5 and 7 (of 9) are inauspicious
+    return 1.5 if ((b - a) % N_NAK + 1) % 9 not in (3, 5, 7) else 0.0
+
+def nak_score_table():
+    table = np.zeros((N_NAK, N_NAK))
+    for a in range(N_NAK):
+        for b in range(N_NAK):
+            table[a, b] = (_tara(a, b) + _tara(b, a) + GANA_POINTS[GANA[a]][GANA[b]]
+                           + (8 if NADI[a] != NADI[b] else 0))
+    return table
+
+# Element pairs that support each other; Ether supports every element
+_FRIENDLY = {frozenset(("Fire", "Air")), frozenset(("Earth", "Water"))}
+_OPPOSED = {frozenset(("Fire", "Water")), frozenset(("Air", "Earth"))}
+
+def _element_harmony(a, b, same, friendly, neutral):
+    names = frozenset((chart_pack.ELEMENTS[a], chart_pack.ELEMENTS[b]))
+    if a == b:
+        return same
+    if names in _FRIENDLY or "Ether" in names:
+        return friendly
+    return 0 if names in _OPPOSED else neutral
+
+def rashi_score_table():
+    table = np.zeros((N_RASHI, N_RASHI))
+    for a in range(N_RASHI):
+        for b in range(N_RASHI):
+            # Bhakoot: 2/12, 5/9 and 6/8 placements score nothing
+            bhakoot = 0 if (b - a) % N_RASHI + 1 in (2, 12, 5, 9, 6, 8) else 7
+            ea, eb = chart_pack.RASHI_ELEMENT[a], chart_pack.RASHI_ELEMENT[b]
+            table[a, b] = bhakoot + _element_harmony(ea, eb, 2, 2, 1)
+    return table
+
+def element_score_table():
+    return np.array([[_element_harmony(a, b, 4, 3, 2) for b in range(N_ELEMENT)] for a in range(N_ELEMENT)],
+                    dtype=np.float64)
+
+NAK_SCORE = nak_score_table()
+RASHI_SCORE = rashi_score_table()
+ELEMENT_SCORE = element_score_table()
+MAX_SCORE = NAK_SCORE.max() + RASHI_SCORE.max() + ELEMENT_SCORE.max()
+
+def chart_cells(charts):
+    element = chart_pack.element_array(charts).astype(np.int64)
+    return (charts["nak_num"].astype(np.int64) * N_RASHI + charts["rashi_num"]) * N_ELEMENT + element
+
+# Scores of one PackedChart against a whole population array (no index);
+# used to check the index and for small populations
+def score_array(query, charts):
+    element = chart_pack.element_array(charts)
+    return (NAK_SCORE[query.nak_num, charts["nak_num"]] + RASHI_SCORE[query.rashi_num, charts["rashi_num"]]
+            + ELEMENT_SCORE[query.element, element])
+
+def score(a, b):
+    return float(NAK_SCORE[a.nak_num, b.nak_num] + RASHI_SCORE[a.rashi_num, b.rashi_num]
+                 + ELEMENT_SCORE[a.element, b.element])
+
+class CompatibilityIndex:
+    def __init__(self, charts):
+        self.charts = charts
+        cells = chart_cells(charts)
+        # Chart ids grouped by cell, i.e. by nakshatra first; ids ascend within a cell
+        self.order = np.argsort(cells, kind="stable").astype(np.int64)
+        counts = np.bincount(cells, minlength=N_CELLS)
+        self.starts = np.concatenate(([0], np.cumsum(counts)))
+        self.cells = np.flatnonzero(counts)
+        self.cell_nak = self.cells // (N_RASHI * N_ELEMENT)
+        self.cell_rashi = self.cells // N_ELEMENT % N_RASHI
+        self.cell_element = self.cells % N_ELEMENT
+
+    def __len__(self):
+        return len(self.charts)
+
+    def cell_scores(self, query):
+        return (NAK_SCORE[query.nak_num, self.cell_nak] + RASHI_SCORE[query.rashi_num, self.cell_rashi]
+                + ELEMENT_SCORE[query.element, self.cell_element])
+
+    # (ids, scores) of the k best matches, best first; equal scores in id
+    # order. exclude is an id to leave out (the query's own chart).
+    def top(self, query, k=10, exclude=None):
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        scores = self.cell_scores(query)
+        ids, out_scores = [], []
+        found = 0
+        for level in np.unique(scores)[::-1]:
+            need = k - found
+            # Ids ascend within a cell, so the first need (+1 for exclude) ids of
+            # each cell are enough to merge the level's smallest ids
+            take = need + (exclude is not None)
+            runs = [self.order[self.starts[c]:min(self.starts[c] + take, self.starts[c + 1])].tolist()
+                    for c in self.cells[scores == level]]
+            level_ids = []
+            for i in heapq.merge(*runs):
+                if i != exclude:
+                    level_ids.append(i)
+                    if len(level_ids) == need:
+                        break
+            level_ids = np.array(level_ids, dtype=np.int64)
+            ids.append(level_ids)
+            out_scores.append(np.full(len(level_ids), level))
+            found += len(level_ids)
+            if found >= k:
+                break
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.concatenate(ids), np.concatenate(out_scores)
+
+    # Number of charts scoring at least min_score with the query
+    def count_at_least(self, query, min_score):
+        scores = self.cell_scores(query)
+        cells = self.cells[scores >= min_score]
+        return int((self.starts[cells + 1] - self.starts[cells]).sum())
+
+    def save(self, path, rows=None):
+        arrays = {"charts": self.charts}
+        if rows is not None:
+            arrays["rows"] = rows
+        np.savez(path, **arrays)
+
+    # (index, input row numbers or None) from a file written by save / build
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            charts = data["charts"]
+            rows = data["rows"] if "rows" in data else None
+        return cls(charts), rows
+
+# Pack every valid row of a batch_chart.py input file; returns (charts, row
+# numbers of those charts in the input). Charts follow the same ephemeris
+# backend and precision tier as the match query (astro_core.chart_numbers).
+def build_population(path, chunk_size=100000):
+    import batch_chart
+    parts, rows = [], []
+    first = 0
+    for chunk in batch_chart.read_chunks(path, chunk_size):
+        jds, _ = batch_chart.chunk_jds(chunk, "numpy")
+        ok = [i for i, jd in enumerate(jds) if jd is not None]
+        if ok:
+            jd = np.array([jds[i] for i in ok])
+            lat = np.array([float(chunk[i]["lat"]) for i in ok])
+            lon = np.array([float(chunk[i]["lon"]) for i in ok])
+            parts.append(chart_pack.pack_arrays(batch_chart.compute_arrays(jd, lat, lon)))
+            rows.append(first + np.array(ok, dtype=np.uint32))
+        first += len(chunk)
+    if not parts:
+        return np.empty(0, dtype=chart_pack.chart_dtype()), np.empty(0, dtype=np.uint32)
+    return np.concatenate(parts), np.concatenate(rows)
+
+def random_population(size, seed=0):
+    rng = np.random.default_rng(seed)
+    jd = rng.uniform(astro_core.julian_date(1900, 1, 1), astro_core.julian_date(2101, 1, 1), size)
+    lat = rng.uniform(-60, 60, size)
+    lon = rng.uniform(-180, 180, size)
+    return chart_pack.pack_arrays(astro_np.compute_charts_jd(jd, lat, lon))
+
+# Index results against a brute-force stable sort of score_array for random
+# queries; returns (mismatching queries, mean index time, mean brute-force time)
+def check(size=1000000, queries=50, k=20, seed=0):
+    charts = random_population(size, seed)
+    index = CompatibilityIndex(charts)
+    rng = np.random.default_rng(seed + 1)
+    bad = 0
+    t_index = t_brute = 0.0
+    for q in rng.integers(0, size, queries).tolist():
+        query = chart_pack.PackedChart.from_record(charts[q])
+        start = time.perf_counter()
+        ids, scores = index.top(query, k, exclude=q)
+        t_index += time.perf_counter() - start
+        start = time.perf_counter()
+        all_scores = score_array(query, charts)
+        all_scores[q] = -1
+        expected = np.argsort(-all_scores, kind="stable")[:k]
+        t_brute += time.perf_counter() - start
+        if not (np.array_equal(ids, expected) and np.array_equal(scores, all_scores[expected])):
+            bad += 1
+    return bad, t_index / queries, t_brute / queries
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank chart compatibility over a packed population.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="pack a batch_chart.py input file into a population file")
+    p.add_argument("input", help=".csv or .parquet births")
+    p.add_argument("output", help="population .npz")
+    p = sub.add_parser("match", help="best matches for one birth")
+    p.add_argument("population", help="population .npz from build")
+    p.add_argument("birth_date", help="YYYY-MM-DD")
+    p.add_argument("birth_time", help="HH:MM")
+    p.add_argument("timezone")
+    p.add_argument("lat", type=float)
+    p.add_argument("lon", type=float)
+    p.add_argument("--top", type=int, default=10)
+    p = sub.add_parser("check", help="compare the index with brute force on a random population")
+    p.add_argument("--size", type=int, default=1000000)
+    p.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        charts, rows = build_population(args.input)
+        CompatibilityIndex(charts).save(args.output, rows)
+        print(f"Packed {len(charts)} charts ({charts.nbytes / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+    elif args.command == "match":
+        import datetime
+        index, rows = CompatibilityIndex.load(args.population)
+        jd = astro_core.local_to_jd(datetime.date.fromisoformat(args.birth_date),
+                                    datetime.time.fromisoformat(args.birth_time), args.timezone)
+        query = chart_pack.PackedChart.from_numbers(astro_core.chart_numbers(jd, args.lat, args.lon))
+        names = query.names()
+        print(f"Query: {names['nakshatra']} pada {names['pada']}, Moon in {names['moon_rashi']}, "
+              f"{names['ruling_bird']} ({names['element']})")
+        ids, scores = index.top(query, args.top)
+        for i, s in zip(ids.tolist(), scores.tolist()):
+            match = chart_pack.PackedChart.from_record(index.charts[i]).names()
+            row = int(rows[i]) if rows is not None else i
+            print(f"  row {row:>9}  {s:4.1f}/{MAX_SCORE:g}  {match['nakshatra']:<15} {match['moon_rashi']:<11} "
+                  f"{match['ruling_bird']} ({match['element']})")
+    else:
+        bad, t_index, t_brute = check(args.size, args.queries)
+        print(f"{args.queries} queries over {args.size} charts: index {1000 * t_index:.2f} ms, "
+              f"brute force {1000 * t_brute:.1f} ms per query")
+        print("index matches brute force" if not bad else f"{bad} queries differ from brute force")
+        return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# ephem_table.py
+# Precomputed Sun/Moon longitude table for the UI's 1900-2100 date range.
+#
+# The table is a flat binary file: a 32-byte header (magic, start JD, step in
+# days, sample count) followed by float32 pairs of tropical (sun, moon)
+# longitudes in degrees. It is opened with mmap, so every worker process that
+# loads it shares the same page-cache pages instead of holding its own copy.
+# Lookups use 4-point cubic Lagrange interpolation: O(1) per timestamp.
+#
+# Worst-case error against calculate_sun_longitude/calculate_moon_longitude,
+# measured by `python ephem_table.py check` over 10^6 random instants:
+#     step 0.5 day (default, 1.2 MB): Sun < 0.00003 deg, Moon < 0.0001 deg
+#     step 1.0 day (0.6 MB):          Sun < 0.00003 deg, Moon < 0.0015 deg
+# The Sun error is float32 rounding; the Moon error is interpolation and
+# shrinks ~16x per halving of the step. 0.0001 deg is 0.36 arcsec, far below
+# the 3deg20' pada width, so table and formulas classify identically except
+# within that distance of a boundary.
+#
+#   python ephem_table.py build            # writes DEFAULT_PATH
+#   python ephem_table.py check --samples 1000000
+import argparse
+import math
+import mmap
+import os
+import struct
+import sys
+
+from astro_core import julian_date, calculate_sun_longitude, calculate_moon_longitude
+
+MAGIC = b"AFEPH1\0\0"
+HEADER = struct.Struct("<8sddq")
+# One day of margin either side so local times east/west of UTC still land inside
+START_JD = julian_date(1899, 12, 31)
+END_JD = julian_date(2101, 1, 2)
+DEFAULT_STEP = 0.5
+DEFAULT_PATH = os.environ.get(
+    "ASTRO_EPHEMERIS_TABLE",
+    os.path.join(os.path.expanduser("~"), ".cache", "astro-fun-app", "ephemeris_1900_2100.bin"),
+)
+
+def build_table(path=DEFAULT_PATH, step=DEFAULT_STEP, start_jd=START_JD, end_jd=END_JD):
+    count = int(math.ceil((end_jd - start_jd) / step)) + 1
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        import numpy as np
+        import astro_np
+    except ImportError:
+        np = None
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, start_jd, step, count))
+        block = 1 << 16
+        for first in range(0, count, block):
+            n = min(block, count - first)
+            if np is not None:
+                d = start_jd + step * np.arange(first, first + n) - 2451545.0
+                pairs = np.empty((n, 2), dtype="<f4")
+                pairs[:, 0] = astro_np.calculate_sun_longitude(d)
+                pairs[:, 1] = astro_np.calculate_moon_longitude(d)
+                f.write(pairs.tobytes())
+            else:
+                values = []
+                for i in range(first, first + n):
+                    d = start_jd + step * i - 2451545.0
+                    values += [calculate_sun_longitude(d), calculate_moon_longitude(d)]
+                f.write(struct.pack(f"<{len(values)}f", *values))
+    # Atomic rename so concurrent readers never see a half-written table
+    os.replace(tmp, path)
+    return path
+
+# Shift a sample onto the same 360-degree branch as ref
+def _near(value, ref):
+    return value - 360.0 * round((value - ref) / 360.0)
+
+class EphemerisTable:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.start_jd, self.step, self.count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an ephemeris table")
+        if len(self._mm) != HEADER.size + 8 * self.count:
+            raise ValueError(f"{path} is truncated")
+        self._values = memoryview(self._mm)[HEADER.size:].cast("f")
+        self.end_jd = self.start_jd + self.step * (self.count - 1)
+
+    def covers(self, jd):
+        return self.start_jd + self.step <= jd <= self.end_jd - 2 * self.step
+
+    def _interp(self, jd, col):
+        x = (jd - self.start_jd) / self.step
+        i = int(x)
+        t = x - i
+        if not (1 <= i <= self.count - 3):
+            raise ValueError(f"JD {jd} is outside the table ({self.start_jd}..{self.end_jd})")
+        v = self._values
+        p1 = v[2 * i + col]
+        p0 = _near(v[2 * (i - 1) + col], p1)
+        p2 = _near(v[2 * (i + 1) + col], p1)
+        p3 = _near(v[2 * (i + 2) + col], p2)
+        # Cubic Lagrange through nodes -1, 0, 1, 2
+        value = (-t * (t - 1) * (t - 2) / 6 * p0
+                 + (t + 1) * (t - 1) * (t - 2) / 2 * p1
+                 - (t + 1) * t * (t - 2) / 2 * p2
+                 + (t + 1) * t * (t - 1) / 6 * p3)
+        return value % 360
+
+    def sun_longitude(self, d):
+        return self._interp(d + 2451545.0, 0)
+
+    def moon_longitude(self, d):
+        return self._interp(d + 2451545.0, 1)
+
+    # Vectorized lookups for astro_np-style batch code
+    def array(self):
+        import numpy as np
+        return np.frombuffer(self._mm, dtype="<f4", count=2 * self.count, offset=HEADER.size).reshape(-1, 2)
+
+    def _interp_array(self, jd, col):
+        import numpy as np
+        x = (np.asarray(jd, dtype=np.float64) - self.start_jd) / self.step
+        i = np.floor(x).astype(np.int64)
+        if i.size and (i.min() < 1 or i.max() > self.count - 3):
+            raise ValueError(f"JD outside the table ({self.start_jd}..{self.end_jd})")
+        t = x - i
+        v = self.array()[:, col]
+        p1 = v[i].astype(np.float64)
+        p0 = v[i - 1] - 360.0 * np.round((v[i - 1] - p1) / 360.0)
+        p2 = v[i + 1] - 360.0 * np.round((v[i + 1] - p1) / 360.0)
+        p3 = v[i + 2] - 360.0 * np.round((v[i + 2] - p2) / 360.0)
+        value = (-t * (t - 1) * (t - 2) / 6 * p0
+                 + (t + 1) * (t - 1) * (t - 2) / 2 * p1
+                 - (t + 1) * t * (t - 2) / 2 * p2
+                 + (t + 1) * t * (t - 1) / 6 * p3)
+        return np.mod(value, 360)
+
+    def sun_longitude_array(self, d):
+        import numpy as np
+        return self._interp_array(np.asarray(d) + 2451545.0, 0)
+
+    def moon_longitude_array(self, d):
+        import numpy as np
+        return self._interp_array(np.asarray(d) + 2451545.0, 1)
+
+    def close(self):
+        self._values.release()
+        self._mm.close()
+
+_tables = {}
+
+# One EphemerisTable per path per process; the pages themselves are shared via mmap
+def load_table(path=DEFAULT_PATH, build=False):
+    table = _tables.get(path)
+    if table is None:
+        if build and not os.path.exists(path):
+            build_table(path)
+        table = _tables[path] = EphemerisTable(path)
+    return table
+
+# Largest angular difference between table and formulas over random instants
+def measure_error(table, samples=100000, seed=0):
+    import numpy as np
+    import astro_np
+    rng = np.random.default_rng(seed)
+    jd = rng.uniform(table.start_jd + table.step, table.end_jd - 2 * table.step, samples)
+    d = jd - 2451545.0
+    errors = {}
+    for name, exact, approx in (
+        ("sun", astro_np.calculate_sun_longitude(d), table.sun_longitude_array(d)),
+        ("moon", astro_np.calculate_moon_longitude(d), table.moon_longitude_array(d)),
+    ):
+        errors[name] = float(np.abs(np.mod(approx - exact + 180, 360) - 180).max())
+    return errors
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or check the Sun/Moon ephemeris table.")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP, help="sample spacing in days")
+    parser.add_argument("--samples", type=int, default=100000, help="random instants for check")
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        build_table(args.path, args.step)
+        print(f"Wrote {args.path} ({os.path.getsize(args.path) / 1e6:.1f} MB)")
+    else:
+        errors = measure_error(load_table(args.path), args.samples)
+        print(f"Max error: sun {errors['sun']:.6f} deg, moon {errors['moon']:.6f} deg")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# lagna_map.py
+# Sidereal ascendant (lagna) rashi over a whole lat/lon grid for one instant.
+#
+# gmst, the obliquity and the ayanamsa depend only on time, so they are
+# computed once. sin/cos of the local sidereal time depend only on longitude
+# and tan(lat) only on latitude, so a grid row costs one atan2 per cell and
+# nothing else. Rows are processed in chunks (bounded memory) and optionally
+# spread over worker processes.
+#
+#   python lagna_map.py 2024-01-01T12:00 --res 0.1 --out lagna.npy --boundaries lagna.geojson
+import argparse
+import concurrent.futures
+import json
+import time
+
+import numpy as np
+
+import astro_np
+from astro_core import rashis
+
+# Time-only part of the ascendant, plus the ayanamsa
+def instant_params(jd):
+    gmst, eps = astro_np.sidereal_time_obliquity(jd)
+    return float(gmst), float(eps), float(astro_np.calculate_ayanamsa(jd))
+
+# Cell-centre coordinates, north to south and west to east
+def grid_axes(res):
+    nlat = int(round(180 / res))
+    nlon = int(round(360 / res))
+    lats = 90 - res * (np.arange(nlat) + 0.5)
+    lons = -180 + res * (np.arange(nlon) + 0.5)
+    return lats, lons
+
+def rashi_block(params, lats, lons):
+    gmst, eps, ayan = params
+    asc_trop = astro_np.ascendant_angle(*astro_np.ascendant_xy(gmst, eps, lats[:, None], lons[None, :]))
+    return np.floor(np.mod(asc_trop - ayan, 360) / 30).astype(np.int8)
+
+def _rashi_rows(params, res, row_start, row_end):
+    lats, lons = grid_axes(res)
+    return rashi_block(params, lats[row_start:row_end], lons)
+
+# int8 raster of sidereal ascendant rashi numbers (0 = Mesha), shape (nlat, nlon)
+def lagna_raster(jd, res=0.1, workers=1, chunk_rows=100):
+    params = instant_params(jd)
+    lats, lons = grid_axes(res)
+    raster = np.empty((len(lats), len(lons)), dtype=np.int8)
+    chunks = [(r, min(r + chunk_rows, len(lats))) for r in range(0, len(lats), chunk_rows)]
+    if workers <= 1:
+        for r0, r1 in chunks:
+            raster[r0:r1] = rashi_block(params, lats[r0:r1], lons)
+        return raster
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_rashi_rows, params, res, r0, r1): r0 for r0, r1 in chunks}
+        for future in concurrent.futures.as_completed(futures):
+            block = future.result()
+            r0 = futures[future]
+            raster[r0:r0 + len(block)] = block
+    return raster
+
+# Polylines (lists of (lon, lat) cell-corner points) along the edges between
+# cells of different rashi. Edges are traced on the corner lattice and chained
+# into lines; straight runs are collapsed to their end points.
+def boundary_polylines(raster, res):
+    nlat, nlon = raster.shape
+    neighbours = {}
+
+    def link(a, b):
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+
+    # Vertical edges between (i, j) and (i, j + 1): corners (i, j+1)-(i+1, j+1)
+    for i, j in zip(*np.nonzero(raster[:, 1:] != raster[:, :-1])):
+        link((int(i), int(j) + 1), (int(i) + 1, int(j) + 1))
+    # Horizontal edges between (i, j) and (i + 1, j): corners (i+1, j)-(i+1, j+1)
+    for i, j in zip(*np.nonzero(raster[1:, :] != raster[:-1, :])):
+        link((int(i) + 1, int(j)), (int(i) + 1, int(j) + 1))
+
+    lines = []
+    used = set()
+
+    def walk(start, nxt):
+        path = [start]
+        prev, cur = start, nxt
+        used.add((min(prev, cur), max(prev, cur)))
+        while True:
+            path.append(cur)
+            if len(neighbours[cur]) != 2:
+                break
+            step = next((n for n in neighbours[cur] if (min(cur, n), max(cur, n)) not in used), None)
+            if step is None:
+                break
+            used.add((min(cur, step), max(cur, step)))
+            prev, cur = cur, step
+        return path
+
+    # Open lines start at ends and junctions, then whatever is left are loops
+    starts = [v for v, ns in neighbours.items() if len(ns) != 2] + list(neighbours)
+    for v in starts:
+        for n in neighbours[v]:
+            if (min(v, n), max(v, n)) not in used:
+                lines.append(_simplify(walk(v, n)))
+    return [[(-180 + res * j, 90 - res * i) for i, j in line] for line in lines]
+
+def _simplify(path):
+    if len(path) < 3:
+        return path
+    out = [path[0]]
+    for a, b, c in zip(path, path[1:], path[2:]):
+        if (b[0] - a[0], b[1] - a[1]) != (c[0] - b[0], c[1] - b[1]):
+            out.append(b)
+    out.append(path[-1])
+    return out
+
+def boundaries_geojson(lines):
+    return {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "properties": {},
+                      "geometry": {"type": "LineString", "coordinates": [list(p) for p in line]}}
+                     for line in lines],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Map the sidereal ascendant rashi over the globe for one instant.")
+    parser.add_argument("utc", help="UTC instant, e.g. 2024-01-01T12:00")
+    parser.add_argument("--res", type=float, default=0.1, help="grid spacing in degrees")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-rows", type=int, default=100, help="latitude rows per chunk")
+    parser.add_argument("--out", help="write the int8 raster as .npy")
+    parser.add_argument("--boundaries", help="write rashi boundary polylines as GeoJSON")
+    args = parser.parse_args(argv)
+
+    jd = float(astro_np.julian_date_from_datetime64(np.datetime64(args.utc, "s")))
+    start = time.perf_counter()
+    raster = lagna_raster(jd, args.res, args.workers, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+    print(f"{raster.shape[0]}x{raster.shape[1]} grid in {elapsed:.2f}s")
+    counts = np.bincount(raster.ravel(), minlength=12)
+    for num, count in enumerate(counts):
+        print(f"  {rashis[num]:<11} {100 * count / raster.size:5.1f}%")
+    if args.out:
+        np.save(args.out, raster)
+    if args.boundaries:
+        lines = boundary_polylines(raster, args.res)
+        with open(args.boundaries, "w", encoding="utf-8") as f:
+            json.dump(boundaries_geojson(lines), f)
+        print(f"{len(lines)} boundary polylines")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# loadgen.py
+# Local load generator for chart_api.py: keeps --concurrency keep-alive
+# connections busy with random chart requests and reports requests/sec and
+# client-side latency percentiles.
+#
+#   python chart_api.py &
+#   python loadgen.py --requests 20000 --concurrency 64
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from chart_api import percentile
+
+TIMEZONES = ["UTC", "Asia/Kolkata", "America/New_York", "Europe/London", "Australia/Sydney"]
+
+def random_request(rng):
+    return {
+        "birth_date": f"{rng.randint(1900, 2100)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "birth_time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+        "timezone": rng.choice(TIMEZONES),
+        "lat": round(rng.uniform(-60, 60), 3),
+        "lon": round(rng.uniform(-180, 180), 3),
+    }
+
+async def client(host, port, count, rng, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            body = json.dumps(random_request(rng)).encode()
+            request = (f"POST /chart HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run(host, port, requests, concurrency, seed):
+    latencies, statuses = [], {}
+    per_client = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, n, random.Random(seed + i), latencies, statuses)
+                           for i, n in enumerate(per_client) if n))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+        "statuses": statuses,
+        "latency_ms": {f"p{int(q * 100)}": 1000 * percentile(latencies, q) for q in (0.5, 0.9, 0.99)},
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test chart_api.py on one machine.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(run(args.host, args.port, args.requests, args.concurrency, args.seed)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# metrics.py
+# Lightweight per-stage timing for the chart pipeline. Off by default: while
+# disabled, @timed functions cost one flag check and stage() hands back a
+# shared no-op context manager. When enabled, each stage feeds a fixed-bucket
+# latency histogram and counters, rendered as Prometheus text
+# (render_prometheus / dump / start_http_server).
+#
+# Sampled cProfile capture can be switched on at runtime: while collection is
+# enabled, request() profiles a profile_rate fraction of requests (one at a
+# time) and merges the results into one pstats report. Profiling and HTTP
+# modules are imported on first use to keep astro_core's cold start unchanged.
+#
+#   ASTRO_METRICS=1 ASTRO_METRICS_PORT=9100 streamlit run app.py
+#   curl localhost:9100/metrics
+import bisect
+import functools
+import math
+import os
+import threading
+import time
+
+enabled = os.environ.get("ASTRO_METRICS", "") not in ("", "0")
+profile_rate = 0.0  # from ASTRO_PROFILE_RATE, see set_profile_rate below
+
+# Upper bounds in seconds, from 1 us (single formula) to 1 s (a slow rerun)
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+           0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, math.inf)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_gauges = {}
+_profile_stats = None
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    # Upper bound of the bucket holding the q-quantile
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return BUCKETS[-1]
+
+def observe(name, seconds):
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.observe(seconds)
+
+def inc(name, n=1):
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+# Gauges are read from fn() at render time (e.g. cache hit counts)
+def register_gauge(name, fn):
+    _gauges[name] = fn
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL = _NullTimer()
+
+def stage(name):
+    return _Timer(name) if enabled else _NULL
+
+# Decorator form for hot functions: one flag check per call while disabled
+def timed(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+# Only one sampled request is profiled at a time: from Python 3.12 cProfile
+# sits on the process-wide sys.monitoring, where a second enabled profiler
+# raises. Sessions that lose the race simply go unprofiled.
+_profile_lock = threading.Lock()
+
+class _Request:
+    __slots__ = ("timer", "profiler")
+
+    def __init__(self):
+        self.timer = _Timer("request")
+        self.profiler = None
+
+    def __enter__(self):
+        inc("requests_total")
+        if profile_rate > 0:
+            import random
+            if random.random() < profile_rate and _profile_lock.acquire(blocking=False):
+                import cProfile
+                self.profiler = cProfile.Profile()
+                try:
+                    self.profiler.enable()
+                except ValueError:
+                    # Another profiler (not ours) is already active
+                    self.profiler = None
+                    _profile_lock.release()
+                else:
+                    inc("profiled_requests_total")
+        self.timer.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.__exit__(*exc)
+        if self.profiler is not None:
+            self.profiler.disable()
+            _profile_lock.release()
+            _merge_profile(self.profiler)
+        return False
+
+# Wraps one whole request: counts it, times it and maybe profiles it
+def request():
+    return _Request() if enabled else _NULL
+
+def _merge_profile(profiler):
+    global _profile_stats
+    import pstats
+    with _lock:
+        if _profile_stats is None:
+            _profile_stats = pstats.Stats(profiler)
+        else:
+            _profile_stats.add(profiler)
+
+def set_enabled(flag):
+    global enabled
+    enabled = bool(flag)
+
+# Clamped to [0, 1]; raises ValueError for anything that is not a number
+def set_profile_rate(rate):
+    global profile_rate
+    rate = float(rate)
+    if math.isnan(rate):
+        raise ValueError("profile rate must be a number")
+    profile_rate = min(max(rate, 0.0), 1.0)
+
+# A bad ASTRO_PROFILE_RATE must not break importing the chart code
+try:
+    set_profile_rate(os.environ.get("ASTRO_PROFILE_RATE") or 0)
+except ValueError:
+    import warnings
+    warnings.warn(f"ignoring ASTRO_PROFILE_RATE={os.environ['ASTRO_PROFILE_RATE']!r}, expected a number in [0, 1]")
+
+def reset():
+    global _profile_stats
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _profile_stats = None
+
+# Top functions by cumulative time over all sampled requests, as text
+def profile_report(limit=25, sort="cumulative"):
+    with _lock:
+        if _profile_stats is None:
+            return "No profiled requests yet."
+        import io
+        out = io.StringIO()
+        _profile_stats.stream = out
+        _profile_stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+def dump_profile(path):
+    with _lock:
+        if _profile_stats is not None:
+            _profile_stats.dump_stats(path)
+
+# {stage: {count, mean_ms, p50_ms, p99_ms}}; quantiles are bucket upper bounds
+def summary():
+    with _lock:
+        return {
+            name: {
+                "count": hist.count,
+                "mean_ms": 1000 * hist.sum / hist.count if hist.count else 0.0,
+                "p50_ms": 1000 * hist.quantile(0.5),
+                "p99_ms": 1000 * hist.quantile(0.99),
+            }
+            for name, hist in sorted(_histograms.items())
+        }
+
+def _le(bound):
+    return "+Inf" if bound == math.inf else repr(bound)
+
+def render_prometheus():
+    lines = []
+    with _lock:
+        histograms = {name: (list(h.counts), h.sum, h.count) for name, h in _histograms.items()}
+        counters = dict(_counters)
+    if histograms:
+        lines += ["# HELP astro_stage_seconds Time spent in each chart pipeline stage.",
+                  "# TYPE astro_stage_seconds histogram"]
+        for name, (counts, total, count) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f'astro_stage_seconds_bucket{{stage="{name}",le="{_le(bound)}"}} {cumulative}')
+            lines.append(f'astro_stage_seconds_sum{{stage="{name}"}} {total!r}')
+            lines.append(f'astro_stage_seconds_count{{stage="{name}"}} {count}')
+    for name, value in sorted(counters.items()):
+        lines += [f"# TYPE astro_{name} counter", f"astro_{name} {value}"]
+    for name, fn in sorted(_gauges.items()):
+        try:
+            value = fn()
+        except Exception:
+            continue
+        lines += [f"# TYPE astro_{name} gauge", f"astro_{name} {value}"]
+    lines.append(f"# TYPE astro_metrics_enabled gauge\nastro_metrics_enabled {int(enabled)}")
+    return "\n".join(lines) + "\n"
+
+def dump(path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+
+# Serve /metrics from a daemon thread; returns the server so callers can shut it down
+def start_http_server(port, host="127.0.0.1"):
+    import http.server
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
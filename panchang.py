@@ -0,0 +1,217 @@
+# panchang.py
+# Streaming Panchang calendar: every Moon pada/nakshatra/rashi change, paksha
+# change, Sun rashi ingress and (optionally) lagna change for one location
+# and date range, with exact local and UTC timestamps.
+#
+# Events are found the same way as in transitions.py: the angles are sampled
+# on a coarse grid to bracket each crossing of a boundary, and the crossing is
+# then refined by bisection to ~0.01 s. The range is processed in blocks of
+# block_days, so memory stays the same for a month or for 200 years. After
+# each block the CLI flushes the output and records a checkpoint (the next
+# JD and the output size); --resume truncates any partial block and carries on.
+#
+#   python panchang.py 2024-01-01 2024-12-31 --timezone Asia/Kolkata --out 2024.csv
+#   python panchang.py 1900-01-01 2100-12-31 --timezone UTC --out all.jsonl --checkpoint all.ckpt --resume
+#   python panchang.py 2024-03-01 2024-03-01 --timezone Asia/Kolkata --lat 12.97 --lon 77.59 --lagna
+import argparse
+import csv
+import datetime
+import io
+import json
+import os
+import sys
+
+import numpy as np
+
+import astro_np
+import transitions
+from astro_core import UTC, get_zone
+
+BLOCK_DAYS = 366
+# The ascendant covers 360 deg a day but unevenly; two minutes keeps at most
+# one rashi boundary per step for |lat| <= LAGNA_MAX_LAT.
+LAGNA_STEP = 2 / 1440
+# Beyond the polar circles the ascendant is not monotonic in time
+LAGNA_MAX_LAT = 66.0
+
+EVENTS = ("pada", "nakshatra", "moon_rashi", "paksha", "sun_rashi", "lagna")
+DEFAULT_EVENTS = EVENTS[:-1]
+FIELDS = ["local_time", "utc_time", "jd", "event", "state", "name"]
+
+def sidereal_ascendant(lat, lon):
+    def func(jd):
+        return np.mod(astro_np.calculate_ascendant(jd, lat, lon) - astro_np.calculate_ayanamsa(jd), 360)
+    return func
+
+# (jds, event names, states) of all requested events in [start_jd, end_jd), in time order
+def block_events(start_jd, end_jd, events=DEFAULT_EVENTS, lat=None, lon=None):
+    parts = []
+    # Every nakshatra (4 padas) and Moon rashi (9 padas) boundary is a pada boundary
+    if {"pada", "nakshatra", "moon_rashi"} & set(events):
+        times, states = transitions.find_crossings(*transitions.SERIES["pada"], start_jd, end_jd)
+        if "pada" in events:
+            parts.append((times, "pada", states))
+        for event, padas in (("nakshatra", 4), ("moon_rashi", 9)):
+            if event in events:
+                starts = states % padas == 0
+                parts.append((times[starts], event, states[starts] // padas))
+    for series in ("paksha", "sun_rashi"):
+        if series in events:
+            times, states = transitions.find_crossings(*transitions.SERIES[series], start_jd, end_jd)
+            parts.append((times, series, states))
+    if "lagna" in events:
+        times, states = transitions.find_crossings(sidereal_ascendant(lat, lon), 30.0, start_jd, end_jd, LAGNA_STEP)
+        parts.append((times, "lagna", states))
+    jds = np.concatenate([p[0] for p in parts] + [np.empty(0)])
+    names = np.concatenate([np.full(len(p[0]), EVENTS.index(p[1]), dtype=np.int8) for p in parts] + [np.empty(0, np.int8)])
+    states = np.concatenate([p[2] for p in parts] + [np.empty(0, np.int16)])
+    # Stable sort keeps pada before nakshatra before moon_rashi at a shared instant
+    order = np.argsort(jds, kind="stable")
+    return jds[order], [EVENTS[i] for i in names[order].tolist()], states[order]
+
+def jd_to_timestamp(jd):
+    return round((jd - 2440587.5) * 86400)
+
+def timestamp_to_jd(ts):
+    return ts / 86400 + 2440587.5
+
+# Local calendar dates (inclusive) in a zone -> [start_jd, end_jd) in UTC
+def date_range_jd(start_date, end_date, timezone):
+    zone = get_zone(timezone)
+    start = datetime.datetime.combine(start_date, datetime.time()).replace(tzinfo=zone)
+    end = datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time()).replace(tzinfo=zone)
+    return timestamp_to_jd(start.timestamp()), timestamp_to_jd(end.timestamp())
+
+def _check_lagna(events, lat, lon):
+    if "lagna" in events:
+        if lat is None or lon is None:
+            raise ValueError("lagna events need a latitude and longitude")
+        if abs(lat) > LAGNA_MAX_LAT:
+            raise ValueError(f"lagna events need |lat| <= {LAGNA_MAX_LAT}")
+
+# Yields (block end jd, [event dicts]) block by block; block end is where a
+# resumed run should start
+def iter_blocks(start_jd, end_jd, timezone, events=DEFAULT_EVENTS, lat=None, lon=None, block_days=BLOCK_DAYS):
+    _check_lagna(events, lat, lon)
+    zone = get_zone(timezone)
+    block_start = start_jd
+    while block_start < end_jd:
+        block_end = min(block_start + block_days, end_jd)
+        jds, names, states = block_events(block_start, block_end, events, lat, lon)
+        rows = []
+        for jd, event, state in zip(jds.tolist(), names, states.tolist()):
+            ts = jd_to_timestamp(jd)
+            rows.append({
+                "local_time": datetime.datetime.fromtimestamp(ts, zone).isoformat(),
+                "utc_time": datetime.datetime.fromtimestamp(ts, UTC).isoformat(),
+                "jd": round(jd, 6),
+                "event": event,
+                "state": state,
+                "name": transitions.TransitionIndex.state_name(event, state),
+            })
+        yield block_end, rows
+        block_start = block_end
+
+# Generator API: one event dict at a time, in time order
+def panchang(start_date, end_date, timezone, events=DEFAULT_EVENTS, lat=None, lon=None, block_days=BLOCK_DAYS):
+    start_jd, end_jd = date_range_jd(start_date, end_date, timezone)
+    for _, rows in iter_blocks(start_jd, end_jd, timezone, events, lat, lon, block_days):
+        yield from rows
+
+def encode_rows(rows, fmt, header=False):
+    if fmt == "jsonl":
+        return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=FIELDS, lineterminator="\n")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+def read_checkpoint(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def write_checkpoint(path, state):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+# Write events for the range to path (or stdout), checkpointing after every
+# block when checkpoint is given; returns the number of events written
+def write_calendar(path, start_jd, end_jd, timezone, events=DEFAULT_EVENTS, lat=None, lon=None, fmt="csv",
+                   block_days=BLOCK_DAYS, checkpoint=None, resume=False):
+    params = {"start_jd": start_jd, "end_jd": end_jd, "timezone": timezone, "events": list(events),
+              "lat": lat, "lon": lon, "format": fmt}
+    state = read_checkpoint(checkpoint) if checkpoint and resume else None
+    if state is not None and state["params"] != params:
+        raise ValueError(f"{checkpoint} was written for different arguments: {state['params']}")
+    if state is not None and path == "-":
+        raise ValueError("--resume needs an output file")
+
+    if path == "-":
+        out = sys.stdout.buffer
+    elif state is not None:
+        out = open(path, "r+b")
+        out.truncate(state["offset"])
+        out.seek(state["offset"])
+    else:
+        out = open(path, "wb")
+    count = state["events"] if state else 0
+    first = state["next_jd"] if state else start_jd
+    try:
+        if state is None and fmt == "csv":
+            out.write(encode_rows([], fmt, header=True))
+        for block_end, rows in iter_blocks(first, end_jd, timezone, events, lat, lon, block_days):
+            out.write(encode_rows(rows, fmt))
+            out.flush()
+            count += len(rows)
+            if checkpoint:
+                os.fsync(out.fileno())
+                write_checkpoint(checkpoint, {"params": params, "next_jd": block_end,
+                                              "offset": out.tell(), "events": count})
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream Panchang events (nakshatra/pada, rashi, paksha, lagna) for a date range.")
+    parser.add_argument("start", type=datetime.date.fromisoformat, help="first local date, YYYY-MM-DD")
+    parser.add_argument("end", type=datetime.date.fromisoformat, help="last local date (inclusive)")
+    parser.add_argument("--timezone", default="UTC", help="IANA zone for the dates and the output times")
+    parser.add_argument("--lat", type=float, help="latitude, needed for --lagna")
+    parser.add_argument("--lon", type=float, help="longitude, needed for --lagna")
+    parser.add_argument("--events", default=",".join(DEFAULT_EVENTS),
+                        help=f"comma-separated subset of {','.join(DEFAULT_EVENTS)}")
+    parser.add_argument("--lagna", action="store_true", help="also emit ascendant rashi changes")
+    parser.add_argument("--out", default="-", help="output .csv or .jsonl file (default CSV on stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default from the --out extension")
+    parser.add_argument("--block-days", type=float, default=BLOCK_DAYS, help="days per block / checkpoint")
+    parser.add_argument("--checkpoint", help="progress file, updated after every block")
+    parser.add_argument("--resume", action="store_true", help="continue from --checkpoint if it exists")
+    args = parser.parse_args(argv)
+
+    events = [e for e in args.events.split(",") if e]
+    unknown = set(events) - set(EVENTS)
+    if unknown:
+        parser.error(f"unknown events: {', '.join(sorted(unknown))}")
+    if args.lagna and "lagna" not in events:
+        events.append("lagna")
+    fmt = args.format or ("jsonl" if args.out.lower().endswith((".jsonl", ".json")) else "csv")
+    try:
+        _check_lagna(events, args.lat, args.lon)
+        start_jd, end_jd = date_range_jd(args.start, args.end, args.timezone)
+        count = write_calendar(args.out, start_jd, end_jd, args.timezone, events, args.lat, args.lon, fmt,
+                               args.block_days, args.checkpoint, args.resume)
+    except (ValueError, KeyError, OSError) as e:
+        sys.exit(str(e))
+    if args.out != "-":
+        print(f"{count} events written to {args.out}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
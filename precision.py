@@ -0,0 +1,402 @@
+# precision.py
+# Precision tiers for the Moon and ascendant models.
+#
+#   fast     the FAST_TERMS largest terms of the Meeus series below, without
+#            the additive terms, for bulk rashi-level screening; the
+#            ascendant is already a single atan2 and stays the default one
+#   default  astro_core's 14-term Moon series and ascendant, what the app has
+#            always used (and the only tier the ephemeris table covers)
+#   high     Meeus, Astronomical Algorithms ch. 47: the 59 longitude terms of
+#            the truncated ELP-2000/82 theory plus the additive terms; the
+#            ascendant uses apparent sidereal time and the true obliquity
+#            (nutation from ch. 22) and is referred back to the mean equinox
+#            so it stays consistent with the Moon, the Sun and the ayanamsa
+#   auto     fast Moon and default ascendant first; a value is recomputed with
+#            high only when it lies within the cheap tier's error bound of a
+#            boundary, so every classification matches high
+#
+# Maximum Moon error against high over 1900-2100 (`python precision.py check`):
+#     fast     0.473 deg bound (sum of the dropped amplitudes), 0.351 measured
+#     default  0.17 deg bound, 0.163 measured
+#     high     ~0.003 deg (10 arcsec) against full ELP-2000/82, per Meeus
+# The default ascendant differs from high by up to 0.19 deg for |lat| <= 66,
+# more towards the poles; auto bounds it per chart from the derivatives of the
+# ascendant with respect to sidereal time and obliquity.
+#
+# Relative cost of the Moon and ascendant per chart (scalar / NumPy, default = 1):
+#     fast 0.7 / 0.6, high 5.2 / 4.7
+#     auto 2.2 / 2.1 at pada resolution (~29% of Moons escalate), 1.1 / 1.1
+#     for rashi-only classification with span=30 (~4% escalate)
+#
+#   ASTRO_PRECISION=auto streamlit run app.py
+#   python batch_chart.py births.csv charts.csv --precision auto
+#   python precision.py check --samples 1000000
+import argparse
+import math
+import sys
+import time
+
+import metrics
+from astro_core import (PRECISION_TIERS, PADA_SPAN, ascendant_angle, ascendant_xy, calculate_ascendant,
+                        calculate_moon_longitude, sidereal_time_obliquity)
+
+FAST_TERMS = 6
+
+# Meeus Table 47.A longitude terms as (D, M, M', F, coefficient in 1e-6 deg),
+# largest first. Terms containing the Sun's anomaly M are scaled by E^|M|.
+MOON_TERMS = [
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314), (0, 0, 2, 0, 213618),
+    (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332), (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066),
+    (2, 0, 1, 0, 53322), (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528), (0, 0, 1, -2, 10980),
+    (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034), (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888),
+    (2, 1, 0, 0, -6766), (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994), (4, 0, 0, 0, 3861), (2, 0, -3, 0, 3665), (0, 1, -2, 0, -2689),
+    (2, 0, -1, 2, -2602), (2, -1, -2, 0, 2390), (1, 0, 1, 0, -2348), (2, -2, 0, 0, 2236),
+    (0, 1, 2, 0, -2120), (0, 2, 0, 0, -2069), (2, -2, -1, 0, 2048), (2, 0, 1, -2, -1773),
+    (2, 0, 0, 2, -1595), (4, -1, -1, 0, 1215), (0, 0, 2, 2, -1110), (3, 0, -1, 0, -892),
+    (2, 1, 1, 0, -810), (4, -1, -2, 0, 759), (0, 2, -1, 0, -713), (2, 2, -1, 0, -700),
+    (2, 1, -2, 0, 691), (2, -1, 0, -2, 596), (4, 0, 1, 0, 549), (0, 0, 4, 0, 537),
+    (4, -1, 0, 0, 520), (1, 0, -2, 0, -487), (2, 1, 0, -2, -399), (0, 0, 2, -2, -381),
+    (1, 1, 1, 0, 351), (3, 0, -2, 0, -340), (4, 0, -3, 0, 330), (2, -1, 2, 0, 327),
+    (0, 2, 1, 0, -323), (1, 1, -1, 0, 299), (2, 0, 3, 0, 294),
+]
+# 3958 sin A1 + 1962 sin(L' - F) + 318 sin A2
+ADDITIVE_AMPLITUDE = 3958 + 1962 + 318
+# Largest E^2 between 1900 and 2100
+E2_MAX = 1.0026 ** 2
+
+# Worst-case Moon error against high in degrees. fast is a strict bound: every
+# dropped term at full amplitude, plus 1e-5 for the T^3 and T^4 parts of the
+# mean arguments it leaves out. default is the measured maximum rounded up.
+MOON_ERROR = {
+    "fast": (sum(abs(t[4]) for t in MOON_TERMS[FAST_TERMS:]) * E2_MAX + ADDITIVE_AMPLITUDE) / 1e6 + 1e-5,
+    "default": 0.17,
+    "high": 0.003,
+}
+# Largest differences between the default and high ascendant inputs over
+# 1900-2100, in degrees: sidereal time, obliquity, and the final nutation shift
+THETA_ERROR = 0.0052
+OBLIQUITY_ERROR = 0.0044
+NUTATION_ERROR = 0.0053
+
+# Meeus 47.1-47.5 mean arguments and the eccentricity factor E
+def moon_arguments(d):
+    T = d / 36525.0
+    Lp = 218.3164477 + 481267.88123421 * T - 0.0015786 * T**2 + T**3 / 538841 - T**4 / 65194000
+    D = 297.8501921 + 445267.1114034 * T - 0.0018819 * T**2 + T**3 / 545868 - T**4 / 113065000
+    M = 357.5291092 + 35999.0502909 * T - 0.0001536 * T**2 + T**3 / 24490000
+    Mp = 134.9633964 + 477198.8675055 * T + 0.0087414 * T**2 + T**3 / 69699 - T**4 / 14712000
+    F = 93.2720950 + 483202.0175233 * T - 0.0036539 * T**2 - T**3 / 3526000 + T**4 / 863310000
+    E = 1 - 0.002516 * T - 0.0000074 * T**2
+    return T, Lp, D, M, Mp, F, E
+
+# Full Meeus series, all terms plus the additive ones
+def meeus_moon_longitude(d):
+    T, Lp, D, M, Mp, F, E = moon_arguments(d)
+    total = (3958 * math.sin(math.radians(119.75 + 131.849 * T))
+             + 1962 * math.sin(math.radians(Lp - F))
+             + 318 * math.sin(math.radians(53.09 + 479264.290 * T)))
+    D, M, Mp, F = math.radians(D), math.radians(M), math.radians(Mp), math.radians(F)
+    E_pow = (1.0, E, E * E)
+    for cd, cm, cmp, cf, coef in MOON_TERMS:
+        total += coef * E_pow[abs(cm)] * math.sin(cd * D + cm * M + cmp * Mp + cf * F)
+    return (Lp + total / 1e6) % 360
+
+# The first FAST_TERMS terms written out, with the mean arguments cut at T^2
+def fast_moon_longitude(d):
+    T = d / 36525.0
+    T2 = T * T
+    Lp = 218.3164477 + 481267.88123421 * T - 0.0015786 * T2
+    D = math.radians(297.8501921 + 445267.1114034 * T - 0.0018819 * T2)
+    M = math.radians(357.5291092 + 35999.0502909 * T - 0.0001536 * T2)
+    Mp = math.radians(134.9633964 + 477198.8675055 * T + 0.0087414 * T2)
+    F = math.radians(93.2720950 + 483202.0175233 * T - 0.0036539 * T2)
+    E = 1 - 0.002516 * T
+    total = (6288774 * math.sin(Mp) + 1274027 * math.sin(2 * D - Mp) + 658314 * math.sin(2 * D)
+             + 213618 * math.sin(2 * Mp) - 185116 * E * math.sin(M) - 114332 * math.sin(2 * F))
+    return (Lp + total / 1e6) % 360
+
+def moon_longitude(d, tier="default"):
+    if tier == "fast":
+        return fast_moon_longitude(d)
+    if tier == "high":
+        return meeus_moon_longitude(d)
+    return calculate_moon_longitude(d)
+
+# Nutation in longitude and obliquity (Meeus ch. 22, 0.5"/0.1" accuracy), degrees
+def nutation(T):
+    omega = math.radians(125.04452 - 1934.136261 * T)
+    L = math.radians(280.4665 + 36000.7698 * T)
+    Lm = math.radians(218.3165 + 481267.8813 * T)
+    dpsi = (-17.20 * math.sin(omega) - 1.32 * math.sin(2 * L) - 0.23 * math.sin(2 * Lm) + 0.21 * math.sin(2 * omega)) / 3600
+    deps = (9.20 * math.cos(omega) + 0.57 * math.cos(2 * L) + 0.10 * math.cos(2 * Lm) - 0.09 * math.cos(2 * omega)) / 3600
+    return dpsi, deps
+
+def ascendant_high(jd, lat, lon):
+    d = jd - 2451545.0
+    T = d / 36525.0
+    dpsi, deps = nutation(T)
+    eps = 23.4392911111 + (-46.8150 * T - 0.00059 * T**2 + 0.001813 * T**3) / 3600 + deps
+    theta = 280.46061837 + 360.98564736629 * d + 0.000387933 * T**2 - T**3 / 38710000 + dpsi * math.cos(math.radians(eps))
+    # True-equinox ascendant back to the mean equinox of date
+    return (ascendant_angle(*ascendant_xy(theta, eps, lat, lon)) - dpsi) % 360
+
+def ascendant(jd, lat, lon, tier="default"):
+    if tier == "high":
+        return ascendant_high(jd, lat, lon)
+    return calculate_ascendant(jd, lat, lon)
+
+# The default ascendant together with a bound on its distance from high: the
+# sidereal time and obliquity errors scaled by the ascendant's sensitivity to
+# each (doubled to cover the linearisation), plus the nutation shift
+def ascendant_with_margin(jd, lat, lon):
+    gmst, eps = sidereal_time_obliquity(jd)
+    y, x = ascendant_xy(gmst, eps, lat, lon)
+    asc_trop = ascendant_angle(y, x)
+    r2 = x * x + y * y
+    if r2 < 1e-12:
+        return asc_trop, 360.0
+    eps_rad = math.radians(eps)
+    sin_e, cos_e = math.sin(eps_rad), math.cos(eps_rad)
+    tan_lat = math.tan(math.radians(lat))
+    # y = sin(lst) and x = cos(lst) cos(eps) - sin(eps) tan(lat)
+    sin_l, cos_l = y, (x + sin_e * tan_lat) / cos_e
+    d_theta = abs(x * cos_l + y * sin_l * cos_e) / r2
+    d_eps = abs(y * (cos_l * sin_e + cos_e * tan_lat)) / r2
+    return asc_trop, 2 * (d_theta * THETA_ERROR + d_eps * OBLIQUITY_ERROR) + NUTATION_ERROR
+
+# Distance in degrees from lon to the nearest multiple of span
+def boundary_distance(lon, span):
+    r = lon % span
+    return min(r, span - r)
+
+# Tropical Moon longitude and ascendant for one chart at the given tier. Under
+# auto the Moon escalates near a pada boundary (every nakshatra and rashi
+# boundary is one; pass span=30 when only the rashi matters) or a paksha
+# change, and the ascendant near a rashi boundary. The returned longitudes
+# are then cheap-tier values, but everything classified from them is exact.
+@metrics.timed("precision")
+def moon_and_ascendant(jd, lat, lon, tier, sun_long, ayan, span=PADA_SPAN):
+    d = jd - 2451545.0
+    if tier != "auto":
+        return moon_longitude(d, tier), ascendant(jd, lat, lon, tier)
+    moon_long = fast_moon_longitude(d)
+    bound = MOON_ERROR["fast"]
+    if boundary_distance(moon_long - ayan, span) <= bound or boundary_distance(moon_long - sun_long, 180) <= bound:
+        metrics.inc("precision_escalations_moon")
+        moon_long = meeus_moon_longitude(d)
+    asc_trop, margin = ascendant_with_margin(jd, lat, lon)
+    if boundary_distance(asc_trop - ayan, 30) <= margin:
+        metrics.inc("precision_escalations_asc")
+        asc_trop = ascendant_high(jd, lat, lon)
+    return moon_long, asc_trop
+
+# Vectorized versions for astro_np-style batch code
+def _moon_term_arrays():
+    import numpy as np
+    terms = np.array(MOON_TERMS, dtype=np.float64)
+    # One coefficient column per power of E, so a single matmul sums each group
+    coefs = np.zeros((len(MOON_TERMS), 3))
+    coefs[np.arange(len(MOON_TERMS)), np.abs(terms[:, 1]).astype(np.int64)] = terms[:, 4]
+    return np.radians(terms[:, :4]), coefs
+
+def meeus_moon_longitude_array(d):
+    import numpy as np
+    T, Lp, D, M, Mp, F, E = moon_arguments(np.asarray(d, dtype=np.float64))
+    multipliers, coefs = _moon_term_arrays()
+    args = np.stack(np.broadcast_arrays(D, M, Mp, F), axis=-1)
+    # (..., 4) @ (4, n_terms) gives every term's argument at once
+    groups = np.sin(args @ multipliers.T) @ coefs
+    total = groups[..., 0] + E * groups[..., 1] + E * E * groups[..., 2]
+    total += (3958 * np.sin(np.radians(119.75 + 131.849 * T))
+              + 1962 * np.sin(np.radians(Lp - F))
+              + 318 * np.sin(np.radians(53.09 + 479264.290 * T)))
+    return np.mod(Lp + total / 1e6, 360)
+
+def fast_moon_longitude_array(d):
+    import numpy as np
+    T = np.asarray(d, dtype=np.float64) / 36525.0
+    T2 = T * T
+    Lp = 218.3164477 + 481267.88123421 * T - 0.0015786 * T2
+    D = np.radians(297.8501921 + 445267.1114034 * T - 0.0018819 * T2)
+    M = np.radians(357.5291092 + 35999.0502909 * T - 0.0001536 * T2)
+    Mp = np.radians(134.9633964 + 477198.8675055 * T + 0.0087414 * T2)
+    F = np.radians(93.2720950 + 483202.0175233 * T - 0.0036539 * T2)
+    E = 1 - 0.002516 * T
+    total = (6288774 * np.sin(Mp) + 1274027 * np.sin(2 * D - Mp) + 658314 * np.sin(2 * D)
+             + 213618 * np.sin(2 * Mp) - 185116 * E * np.sin(M) - 114332 * np.sin(2 * F))
+    return np.mod(Lp + total / 1e6, 360)
+
+def moon_longitude_array(d, tier="default"):
+    import astro_np
+    if tier == "fast":
+        return fast_moon_longitude_array(d)
+    if tier == "high":
+        return meeus_moon_longitude_array(d)
+    return astro_np.calculate_moon_longitude(d)
+
+def nutation_array(T):
+    import numpy as np
+    omega = np.radians(125.04452 - 1934.136261 * T)
+    L = np.radians(280.4665 + 36000.7698 * T)
+    Lm = np.radians(218.3165 + 481267.8813 * T)
+    dpsi = (-17.20 * np.sin(omega) - 1.32 * np.sin(2 * L) - 0.23 * np.sin(2 * Lm) + 0.21 * np.sin(2 * omega)) / 3600
+    deps = (9.20 * np.cos(omega) + 0.57 * np.cos(2 * L) + 0.10 * np.cos(2 * Lm) - 0.09 * np.cos(2 * omega)) / 3600
+    return dpsi, deps
+
+def ascendant_high_array(jd, lat, lon):
+    import numpy as np
+    import astro_np
+    d = np.asarray(jd, dtype=np.float64) - 2451545.0
+    T = d / 36525.0
+    dpsi, deps = nutation_array(T)
+    eps = 23.4392911111 + (-46.8150 * T - 0.00059 * T**2 + 0.001813 * T**3) / 3600 + deps
+    theta = 280.46061837 + 360.98564736629 * d + 0.000387933 * T**2 - T**3 / 38710000 + dpsi * np.cos(np.radians(eps))
+    return np.mod(astro_np.ascendant_angle(*astro_np.ascendant_xy(theta, eps, lat, lon)) - dpsi, 360)
+
+def ascendant_array(jd, lat, lon, tier="default"):
+    import astro_np
+    if tier == "high":
+        return ascendant_high_array(jd, lat, lon)
+    return astro_np.calculate_ascendant(jd, lat, lon)
+
+def ascendant_with_margin_array(jd, lat, lon):
+    import numpy as np
+    import astro_np
+    gmst, eps = astro_np.sidereal_time_obliquity(jd)
+    y, x = astro_np.ascendant_xy(gmst, eps, lat, lon)
+    asc_trop = astro_np.ascendant_angle(y, x)
+    eps_rad = np.radians(eps)
+    sin_e, cos_e = np.sin(eps_rad), np.cos(eps_rad)
+    tan_lat = np.tan(np.radians(lat))
+    sin_l, cos_l = y, (x + sin_e * tan_lat) / cos_e
+    r2 = np.maximum(x * x + y * y, 1e-12)
+    d_theta = np.abs(x * cos_l + y * sin_l * cos_e) / r2
+    d_eps = np.abs(y * (cos_l * sin_e + cos_e * tan_lat)) / r2
+    return asc_trop, 2 * (d_theta * THETA_ERROR + d_eps * OBLIQUITY_ERROR) + NUTATION_ERROR
+
+def boundary_distance_array(lon, span):
+    import numpy as np
+    r = np.mod(lon, span)
+    return np.minimum(r, span - r)
+
+# Array form of moon_and_ascendant; under auto only the escalated elements
+# are recomputed with the high tier
+def moon_and_ascendant_array(jd, lat, lon, tier, sun_long, ayan, span=PADA_SPAN):
+    import numpy as np
+    jd = np.asarray(jd, dtype=np.float64)
+    d = jd - 2451545.0
+    if tier != "auto":
+        return moon_longitude_array(d, tier), ascendant_array(jd, lat, lon, tier)
+    jd, lat, lon, sun_long, ayan = np.broadcast_arrays(jd, lat, lon, sun_long, ayan)
+    d = jd - 2451545.0
+    moon_long = fast_moon_longitude_array(d)
+    bound = MOON_ERROR["fast"]
+    near = (boundary_distance_array(moon_long - ayan, span) <= bound) | (boundary_distance_array(moon_long - sun_long, 180) <= bound)
+    if near.any():
+        metrics.inc("precision_escalations_moon", int(near.sum()))
+        moon_long[near] = meeus_moon_longitude_array(d[near])
+    asc_trop, margin = ascendant_with_margin_array(jd, lat, lon)
+    near = boundary_distance_array(asc_trop - ayan, 30) <= margin
+    if near.any():
+        metrics.inc("precision_escalations_asc", int(near.sum()))
+        asc_trop[near] = ascendant_high_array(jd[near], lat[near], lon[near])
+    return moon_long, asc_trop
+
+def _angle_error(a, b):
+    import numpy as np
+    return np.abs(np.mod(a - b + 180, 360) - 180)
+
+def _best_time(fn, min_seconds=0.2):
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / runs
+
+# Errors of each tier against high, relative costs, and whether auto ever
+# classifies a chart differently from high
+def check(samples=200000, seed=0, chunk=100000):
+    import numpy as np
+    import astro_np
+    from ephem_table import START_JD, END_JD
+    rng = np.random.default_rng(seed)
+    moon_error = {"fast": 0.0, "default": 0.0}
+    asc_error = 0.0
+    mismatches = {"pada": 0, "rashi": 0, "paksha": 0, "asc_rashi": 0}
+    escalated = {"moon": 0, "moon_rashi_only": 0, "asc": 0}
+    for first in range(0, samples, chunk):
+        n = min(chunk, samples - first)
+        jd = rng.uniform(START_JD + 1, END_JD - 1, n)
+        lat = rng.uniform(-66, 66, n)
+        lon = rng.uniform(-180, 180, n)
+        d = jd - 2451545.0
+        sun_long = astro_np.calculate_sun_longitude(d)
+        ayan = astro_np.calculate_ayanamsa(jd)
+        high_moon = meeus_moon_longitude_array(d)
+        high_asc = ascendant_high_array(jd, lat, lon)
+        for tier in moon_error:
+            moon_error[tier] = max(moon_error[tier], float(_angle_error(moon_longitude_array(d, tier), high_moon).max()))
+        asc_error = max(asc_error, float(_angle_error(astro_np.calculate_ascendant(jd, lat, lon), high_asc).max()))
+
+        moon_long, asc_trop = moon_and_ascendant_array(jd, lat, lon, "auto", sun_long, ayan)
+        sid, sid_high = np.mod(moon_long - ayan, 360), np.mod(high_moon - ayan, 360)
+        mismatches["pada"] += int((np.floor(sid / PADA_SPAN) != np.floor(sid_high / PADA_SPAN)).sum())
+        mismatches["rashi"] += int((np.floor(sid / 30) != np.floor(sid_high / 30)).sum())
+        mismatches["paksha"] += int((astro_np.is_shukla(sun_long, moon_long) != astro_np.is_shukla(sun_long, high_moon)).sum())
+        mismatches["asc_rashi"] += int((np.floor(np.mod(asc_trop - ayan, 360) / 30)
+                                        != np.floor(np.mod(high_asc - ayan, 360) / 30)).sum())
+        fast = fast_moon_longitude_array(d)
+        bound = MOON_ERROR["fast"]
+        paksha_near = boundary_distance_array(fast - sun_long, 180) <= bound
+        escalated["moon"] += int(((boundary_distance_array(fast - ayan, PADA_SPAN) <= bound) | paksha_near).sum())
+        escalated["moon_rashi_only"] += int(((boundary_distance_array(fast - ayan, 30) <= bound) | paksha_near).sum())
+        asc, margin = ascendant_with_margin_array(jd, lat, lon)
+        escalated["asc"] += int((boundary_distance_array(asc - ayan, 30) <= margin).sum())
+
+    # Relative cost of the Moon + ascendant for one chart, scalar and batch
+    jd = rng.uniform(START_JD + 1, END_JD - 1, 2000)
+    lat = rng.uniform(-66, 66, 2000)
+    lon = rng.uniform(-180, 180, 2000)
+    d = jd - 2451545.0
+    sun_long = astro_np.calculate_sun_longitude(d)
+    ayan = astro_np.calculate_ayanamsa(jd)
+    rows = list(zip(jd.tolist(), lat.tolist(), lon.tolist(), sun_long.tolist(), ayan.tolist()))
+    cost = {}
+    for name, tier, span in [(tier, tier, PADA_SPAN) for tier in PRECISION_TIERS] + [("auto/30", "auto", 30)]:
+        scalar = _best_time(lambda: [moon_and_ascendant(*row[:3], tier, *row[3:], span) for row in rows])
+        batch = _best_time(lambda: moon_and_ascendant_array(jd, lat, lon, tier, sun_long, ayan, span))
+        cost[name] = (scalar, batch)
+    base = cost["default"]
+    return {
+        "moon_error": moon_error,
+        "moon_bound": {tier: MOON_ERROR[tier] for tier in moon_error},
+        "asc_error": asc_error,
+        "escalated": {k: v / samples for k, v in escalated.items()},
+        "mismatches": mismatches,
+        "relative_cost": {tier: (s / base[0], b / base[1]) for tier, (s, b) in cost.items()},
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the Moon/ascendant precision tiers against the high tier.")
+    parser.add_argument("command", choices=["check"])
+    parser.add_argument("--samples", type=int, default=200000, help="random charts, 1900-2100, |lat| <= 66")
+    args = parser.parse_args(argv)
+    result = check(args.samples)
+    for tier, error in result["moon_error"].items():
+        print(f"moon {tier:<8} max error {error:.4f} deg (bound {result['moon_bound'][tier]:.4f})")
+    print(f"asc  default  max error {result['asc_error']:.4f} deg")
+    for name, rate in result["escalated"].items():
+        print(f"auto escalates {name}: {100 * rate:.1f}%")
+    for tier, (scalar, batch) in result["relative_cost"].items():
+        print(f"cost {tier:<8} scalar {scalar:.2f}x  numpy {batch:.2f}x")
+    bad = {k: v for k, v in result["mismatches"].items() if v}
+    print("auto matches high on every classification" if not bad else f"auto differs from high: {bad}")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
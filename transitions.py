@@ -0,0 +1,209 @@
+# transitions.py
+# Index of the instants where the Moon's nakshatra/pada, the Moon's and Sun's
+# rashi, and the paksha change. Sidereal Moon, sidereal Sun and the Moon-Sun
+# elongation all increase monotonically, so every change is a crossing of a
+# multiple of a fixed span (3deg20', 30deg or 180deg). Crossings are bracketed
+# on a coarse time grid and refined by bisection on the astro_np functions;
+# afterwards classifying a timestamp is a binary search in sorted arrays.
+#
+#   index = TransitionIndex.build(julian_date(1900, 1, 1), julian_date(2101, 1, 1))
+#   index.classify(jd)                       # nak_num, pada, rashi_num, ...
+#   index.next_change("nakshatra", jd)       # (jd of change, next nakshatra)
+import argparse
+
+import numpy as np
+
+import astro_np
+from astro_core import julian_date, nakshatras, rashis, PADA_SPAN, PAKSHAS
+
+# Bracketing step in days: the Moon moves at most ~15.4 deg/day, so a 0.1-day
+# grid holds at most one pada boundary per interval.
+DEFAULT_STEP = 0.1
+# Bisection stops once the bracket is narrower than this (about 0.01 s)
+DEFAULT_TOL = 1e-7
+BLOCK_DAYS = 10000
+
+def sidereal_moon(jd):
+    d = jd - 2451545.0
+    return np.mod(astro_np.calculate_moon_longitude(d) - astro_np.calculate_ayanamsa(jd), 360)
+
+def sidereal_sun(jd):
+    d = jd - 2451545.0
+    return np.mod(astro_np.calculate_sun_longitude(d) - astro_np.calculate_ayanamsa(jd), 360)
+
+def elongation(jd):
+    d = jd - 2451545.0
+    return np.mod(astro_np.calculate_moon_longitude(d) - astro_np.calculate_sun_longitude(d), 360)
+
+# Series name -> (angle function, span in degrees); the state after a crossing
+# of k * span is k modulo the number of spans in a circle.
+SERIES = {
+    "pada": (sidereal_moon, PADA_SPAN),
+    "moon_rashi": (sidereal_moon, 30.0),
+    "sun_rashi": (sidereal_sun, 30.0),
+    "paksha": (elongation, 180.0),
+}
+
+# Bring raw angles onto the same 360-degree branch as ref
+def _unwrap_near(raw, ref):
+    return ref + np.mod(raw - ref + 180, 360) - 180
+
+def _unwrap(values):
+    return np.concatenate(([values[0]], values[0] + np.cumsum(np.mod(np.diff(values) + 180, 360) - 180)))
+
+def _bisect(func, lo, hi, f_lo, target, tol):
+    while lo.size and (hi - lo).max() > tol:
+        mid = 0.5 * (lo + hi)
+        f_mid = _unwrap_near(func(mid), f_lo)
+        below = f_mid < target
+        lo = np.where(below, mid, lo)
+        f_lo = np.where(below, f_mid, f_lo)
+        hi = np.where(below, hi, mid)
+    return 0.5 * (lo + hi)
+
+# Times in [start_jd, end_jd) where func crosses a multiple of span, with the
+# state (crossing count modulo 360/span) entered at each time.
+def find_crossings(func, span, start_jd, end_jd, step=DEFAULT_STEP, tol=DEFAULT_TOL):
+    n_states = int(round(360 / span))
+    n = int(np.ceil((end_jd - start_jd) / step))
+    grid = start_jd + step * np.arange(n + 1)
+    grid[-1] = end_jd
+    f = _unwrap(func(grid))
+    k = np.floor(f / span)
+    i = np.nonzero(np.diff(k))[0]
+    if np.any(np.diff(k)[i] > 1):
+        raise ValueError(f"step {step} is too coarse for span {span}")
+    target = k[i + 1] * span
+    times = _bisect(func, grid[i], grid[i + 1], f[i], target, tol)
+    states = (k[i + 1] % n_states).astype(np.int16)
+    return times, states
+
+def state_at(series, jd):
+    func, span = SERIES[series]
+    return int(np.floor(float(func(np.float64(jd))) / span)) % int(round(360 / span))
+
+class TransitionIndex:
+    def __init__(self, start_jd, end_jd, times, states, initial):
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        self.times = times
+        self.states = states
+        self.initial = initial
+
+    @classmethod
+    def build(cls, start_jd, end_jd, step=DEFAULT_STEP, tol=DEFAULT_TOL):
+        times, states, initial = {}, {}, {}
+        for name, (func, span) in SERIES.items():
+            initial[name] = state_at(name, start_jd)
+            t_parts, s_parts = [], []
+            # Blocks keep the sampling grid small for long ranges
+            block_start = start_jd
+            while block_start < end_jd:
+                block_end = min(block_start + BLOCK_DAYS, end_jd)
+                t, s = find_crossings(func, span, block_start, block_end, step, tol)
+                t_parts.append(t)
+                s_parts.append(s)
+                block_start = block_end
+            times[name] = np.concatenate(t_parts)
+            states[name] = np.concatenate(s_parts)
+        return cls(start_jd, end_jd, times, states, initial)
+
+    def save(self, path):
+        arrays = {"range": np.array([self.start_jd, self.end_jd])}
+        for name in SERIES:
+            arrays[f"{name}_times"] = self.times[name]
+            arrays[f"{name}_states"] = self.states[name]
+            arrays[f"{name}_initial"] = np.array(self.initial[name])
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            start_jd, end_jd = data["range"].tolist()
+            times = {name: data[f"{name}_times"] for name in SERIES}
+            states = {name: data[f"{name}_states"] for name in SERIES}
+            initial = {name: int(data[f"{name}_initial"]) for name in SERIES}
+        return cls(start_jd, end_jd, times, states, initial)
+
+    def _check_range(self, jd):
+        lo, hi = np.min(jd), np.max(jd)
+        if lo < self.start_jd or hi >= self.end_jd:
+            raise ValueError(f"JD outside the index range ({self.start_jd}..{self.end_jd})")
+
+    # State of a series at jd (scalar or array) by binary search
+    def state(self, series, jd):
+        self._check_range(jd)
+        j = np.searchsorted(self.times[series], jd, side="right") - 1
+        states = self.states[series]
+        if np.ndim(j) == 0:
+            return int(states[j]) if j >= 0 else self.initial[series]
+        return np.where(j >= 0, states[np.maximum(j, 0)], self.initial[series])
+
+    # Same fields as astro_core.chart_numbers, minus the location-dependent ascendant
+    def classify(self, jd):
+        pada_state = self.state("pada", jd)
+        paksha = self.state("paksha", jd)
+        return {
+            "nak_num": pada_state // 4,
+            "pada": pada_state % 4 + 1,
+            "rashi_num": self.state("moon_rashi", jd),
+            "paksha": np.where(paksha == 0, "Shukla", "Krishna") if np.ndim(jd) else PAKSHAS[paksha],
+            "sun_rashi_num": self.state("sun_rashi", jd),
+        }
+
+    # (start jd, end jd, state) of the span containing jd; start/end are None
+    # where the span runs past the ends of the index
+    def current_span(self, series, jd):
+        self._check_range(jd)
+        times = self.times[series]
+        j = int(np.searchsorted(times, jd, side="right"))
+        start = float(times[j - 1]) if j > 0 else None
+        end = float(times[j]) if j < len(times) else None
+        return start, end, self.state(series, jd)
+
+    # (jd, new state) of the first change strictly after jd, or None past the index
+    def next_change(self, series, jd):
+        if series == "nakshatra":
+            return self._next_nakshatra(jd)
+        self._check_range(jd)
+        times = self.times[series]
+        j = int(np.searchsorted(times, jd, side="right"))
+        if j >= len(times):
+            return None
+        return float(times[j]), int(self.states[series][j])
+
+    def _next_nakshatra(self, jd):
+        self._check_range(jd)
+        times, states = self.times["pada"], self.states["pada"]
+        j = int(np.searchsorted(times, jd, side="right"))
+        # Nakshatra boundaries are the pada crossings into pada 1, at most 4 ahead
+        starts = np.flatnonzero(states[j:j + 4] % 4 == 0)
+        if not starts.size:
+            return None
+        k = j + int(starts[0])
+        return float(times[k]), int(states[k]) // 4
+
+    # Human-readable name for a state of a series
+    @staticmethod
+    def state_name(series, state):
+        if series == "pada":
+            return f"{nakshatras[state // 4]} pada {state % 4 + 1}"
+        if series == "nakshatra":
+            return nakshatras[state]
+        if series == "paksha":
+            return PAKSHAS[state]
+        return rashis[state]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a nakshatra/rashi/paksha transition index.")
+    parser.add_argument("output", help="output .npz file")
+    parser.add_argument("--start-year", type=int, default=1900)
+    parser.add_argument("--end-year", type=int, default=2100, help="last year included")
+    args = parser.parse_args(argv)
+    index = TransitionIndex.build(julian_date(args.start_year, 1, 1), julian_date(args.end_year + 1, 1, 1))
+    index.save(args.output)
+    counts = ", ".join(f"{name} {len(index.times[name])}" for name in SERIES)
+    print(f"Wrote {args.output}: {counts}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# tz_batch.py
+# Batch local-to-UTC conversion. Each zone's UTC-offset history is turned
+# into sorted transition arrays once per process, after which whole arrays of
+# naive local datetimes convert with one np.searchsorted. The transitions are
+# read from the zone's TZif file (the same file ZoneInfo loads) and confirmed
+# against the ZoneInfo object; only the span after the file's last explicit
+# transition, where the zone's POSIX TZ rule applies, is probed.
+#
+# Gaps and folds follow datetime's fold=0 rule, exactly like
+# local_dt.replace(tzinfo=zone).astimezone(UTC) in astro_core.local_to_jd:
+#   - a local time inside a gap (clocks jump forward, e.g. 02:30 on a spring
+#     DST day) uses the offset from *before* the jump, so it lands after the
+#     gap in UTC terms (02:30 EST -> 07:30 UTC, which reads 03:30 EDT);
+#   - a repeated local time (clocks go back) resolves to its *first*
+#     occurrence, i.e. also the pre-transition offset.
+# Both fall out of placing each transition at local wall time
+# T + max(old offset, new offset), which is how zoneinfo does it.
+#
+#   python tz_batch.py check            # compare with astimezone for every zone
+import argparse
+import datetime
+import functools
+import os
+import struct
+import zoneinfo
+
+import numpy as np
+
+import astro_np
+from astro_core import get_zone, timezone_names
+
+# Probed range (UTC seconds since 1970); local times outside it fall back to
+# per-element astimezone. Covers the UI's 1900-2100 with a month of margin.
+RANGE_START = int(datetime.datetime(1899, 12, 1, tzinfo=datetime.timezone.utc).timestamp())
+RANGE_END = int(datetime.datetime(2101, 2, 1, tzinfo=datetime.timezone.utc).timestamp())
+# Step for probing spans not covered by explicit transitions. Two transitions
+# less than this apart that cancel out would be missed; the annual POSIX
+# rules that govern those spans never switch twice within a week, which
+# `check` confirms against astimezone for every zone.
+PROBE_STEP = 7 * 86400
+
+class ZoneTable:
+    def __init__(self, name, before, utc, offsets, wall):
+        self.name = name
+        self.before = before    # offset (s) before the first transition
+        self.utc = utc          # transition instants, UTC seconds
+        self.offsets = offsets  # offset (s) in force from each transition on
+        self.wall = wall        # local wall-clock seconds at which each applies (fold=0)
+
+    # Offsets (s) for naive local times given as int64 seconds since 1970
+    def local_offsets(self, local_s):
+        idx = np.searchsorted(self.wall, local_s, side="right") - 1
+        if not len(self.offsets):
+            return np.full(np.shape(local_s), self.before, dtype=np.int64)
+        return np.where(idx >= 0, self.offsets[np.maximum(idx, 0)], self.before)
+
+def _offset_at(zone, ts):
+    return int(datetime.datetime.fromtimestamp(ts, zone).utcoffset().total_seconds())
+
+# (explicit transition instants in UTC seconds, whether a DST rule follows
+# them) from a zone's TZif file, looked up in the same order as ZoneInfo
+# (TZPATH, then the tzdata package); None when the file cannot be read
+def tzif_transitions(name):
+    try:
+        data = None
+        for root in zoneinfo.TZPATH:
+            path = os.path.join(root, name)
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    data = f.read()
+                break
+        if data is None:
+            import importlib.resources
+            package, _, resource = f"tzdata.zoneinfo.{name}".replace("/", ".").rpartition(".")
+            data = importlib.resources.files(package).joinpath(resource).read_bytes()
+        if data[:4] != b"TZif":
+            return None
+        isut, isstd, leap, count, types, chars = struct.unpack(">6l", data[20:44])
+        if data[4:5] == b"\0":
+            # Version 1 has no footer rule; treat the tail as unknown
+            return list(struct.unpack(f">{count}l", data[44:44 + 4 * count])), True
+        # Version 2+: skip the 32-bit block, read the 64-bit one and the POSIX
+        # TZ string after it, which has a comma only if it switches to DST
+        offset = 44 + 5 * count + 6 * types + chars + 8 * leap + isstd + isut
+        isut, isstd, leap, count, types, chars = struct.unpack(">6l", data[offset + 20:offset + 44])
+        times = list(struct.unpack(f">{count}q", data[offset + 44:offset + 44 + 8 * count]))
+        footer = offset + 44 + 9 * count + 6 * types + chars + 12 * leap + isstd + isut
+        return times, b"," in data[footer:]
+    except (OSError, ImportError, ValueError, struct.error):
+        return None
+
+# Append every offset change in (t, end] to utc/offsets, probing every step
+# seconds and bisecting each change to the exact second
+def _probe(zone, t, end, step, prev, utc, offsets):
+    while t < end:
+        nxt = min(t + step, end)
+        off = _offset_at(zone, nxt)
+        if off != prev:
+            lo, hi = t, nxt
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _offset_at(zone, mid) == prev:
+                    lo = mid
+                else:
+                    hi = mid
+            utc.append(hi)
+            offsets.append(off)
+            prev = off
+        t = nxt
+
+@functools.lru_cache(maxsize=None)
+def zone_table(name, start=RANGE_START, end=RANGE_END, step=PROBE_STEP):
+    zone = get_zone(name)
+    utc, offsets = [], []
+    before = prev = _offset_at(zone, start)
+    tzif = tzif_transitions(name)
+    if tzif is None:
+        # No readable file: probe the whole range daily
+        _probe(zone, start, end, 86400, prev, utc, offsets)
+    else:
+        # Offsets between explicit transitions are constant, so each one only
+        # needs confirming; transitions that change just the abbreviation or
+        # the DST flag are dropped
+        explicit, rule = tzif
+        for t in explicit:
+            if start < t <= end:
+                off = _offset_at(zone, t)
+                if off != prev:
+                    utc.append(t)
+                    offsets.append(off)
+                    prev = off
+        tail = max(explicit[-1], start) if explicit else start
+        if rule and tail < end:
+            _probe(zone, tail, end, step, prev, utc, offsets)
+    utc = np.array(utc, dtype=np.int64)
+    offsets = np.array(offsets, dtype=np.int64)
+    previous = np.concatenate(([before], offsets[:-1])).astype(np.int64)
+    wall = utc + np.maximum(previous, offsets)
+    return ZoneTable(name, before, utc, offsets, wall)
+
+def _slow_local_to_utc(local_s, name):
+    zone = get_zone(name)
+    out = np.empty(len(local_s), dtype=np.int64)
+    epoch = datetime.datetime(1970, 1, 1)
+    for i, s in enumerate(local_s.tolist()):
+        dt = (epoch + datetime.timedelta(seconds=s)).replace(tzinfo=zone)
+        out[i] = int(dt.astimezone(datetime.timezone.utc).timestamp())
+    return out
+
+# datetime64 naive local times in one zone -> datetime64[s] UTC
+def local_to_utc(local, name):
+    local_s = np.asarray(local, dtype="datetime64[s]").astype(np.int64)
+    table = zone_table(name)
+    utc_s = local_s - table.local_offsets(local_s)
+    outside = (local_s < RANGE_START + 86400) | (local_s >= RANGE_END - 86400)
+    if outside.any():
+        utc_s[outside] = _slow_local_to_utc(local_s[outside], name)
+    return utc_s.astype("datetime64[s]")
+
+# Naive local times with a zone name each (or one name for all) -> UTC
+# Julian dates, truncated to the UTC minute like astro_core.local_to_jd
+def local_to_jd(local, zones):
+    local = np.asarray(local, dtype="datetime64[s]")
+    utc = np.empty(local.shape, dtype="datetime64[s]")
+    if isinstance(zones, str):
+        utc[...] = local_to_utc(local, zones)
+    else:
+        zones = np.asarray(zones)
+        names, inverse = np.unique(zones, return_inverse=True)
+        for k, name in enumerate(names):
+            mask = inverse.reshape(zones.shape) == k
+            utc[mask] = local_to_utc(local[mask], str(name))
+    return astro_np.julian_date_from_datetime64(utc.astype("datetime64[m]"))
+
+# Compare against astimezone for random local times plus the neighbourhood of
+# every transition; returns {zone: mismatch count} for zones that disagree
+def check(names=None, samples=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    lo = RANGE_START + 2 * 86400
+    hi = RANGE_END - 2 * 86400
+    bad = {}
+    for name in names or timezone_names():
+        table = zone_table(name)
+        probes = [rng.integers(lo, hi, samples)]
+        for shift in (-3 * 3600, -1, 0, 1, 1800, 3 * 3600):
+            probes.append(table.wall + shift)
+            probes.append(table.utc + table.offsets + shift)
+        local_s = np.concatenate(probes)
+        local_s = local_s[(local_s >= lo) & (local_s < hi)]
+        fast = local_to_utc(local_s.astype("datetime64[s]"), name).astype(np.int64)
+        slow = _slow_local_to_utc(local_s, name)
+        mismatches = int((fast != slow).sum())
+        if mismatches:
+            bad[name] = mismatches
+    return bad
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify batch timezone conversion against zoneinfo.")
+    parser.add_argument("command", choices=["check"])
+    parser.add_argument("zones", nargs="*", help="zone names (default: all available)")
+    parser.add_argument("--samples", type=int, default=2000, help="random local times per zone")
+    args = parser.parse_args(argv)
+    names = args.zones or timezone_names()
+    bad = check(names, args.samples)
+    for name, count in sorted(bad.items()):
+        print(f"{name}: {count} mismatches")
+    print(f"{len(names) - len(bad)}/{len(names)} zones agree with astimezone")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())